@@ -0,0 +1,75 @@
+"""
+Fixtures shared by the benchmarks: encoded API responses and a local stand-in for the API
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# The benchmarks measure the package in this repository rather than an installed one
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.factories import make_full_results
+
+# (pods, subpods per pod) of the FullResults responses benchmarked, from typical to large
+SHAPES = [(8, 3), (20, 4), (40, 5), (60, 3), (100, 2)]
+
+
+def make_payloads(shapes=SHAPES):
+  """Returns the encoded FullResults responses of the given shapes"""
+  return [json.dumps(make_full_results(f"q{i}", n, s)).encode() for i, (n, s) in enumerate(shapes)]
+
+
+def load_responses():
+  """Returns the raw FullResults responses of the corpus in `benchmarks/responses`, by name.
+  Unlike generated ones, they have the irregular shape of real responses, with states,
+  assumptions, MathML and pods of very different sizes"""
+  directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "responses")
+  responses = {}
+  for name in sorted(os.listdir(directory)):
+    if name.endswith(".json"):
+      with open(os.path.join(directory, name), "rb") as f:
+        responses[name[:-len(".json")]] = json.load(f)["queryresult"]
+  return responses
+
+
+class _Handler(BaseHTTPRequestHandler):
+  protocol_version = "HTTP/1.1"
+  # Headers and body are written separately, which Nagle's algorithm would delay on kept-alive connections
+  disable_nagle_algorithm = True
+
+  def log_message(self, *args):
+    pass
+
+  def do_GET(self):
+    url = urlparse(self.path)
+    query = {k: v[0] for k, v in parse_qs(url.query).items()}
+    if self.server.delay:
+      time.sleep(self.server.delay)
+    if url.path.endswith("/query"):
+      body = json.dumps(make_full_results(query.get("input", ""))).encode()
+    else:
+      body = f"answer to {query.get('i', '')}".encode()
+    self.send_response(200)
+    self.send_header("Content-Length", str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+
+def serve(delay: float = 0) -> str:
+  """Starts a local stand-in for the API in the background, returning its base url.
+  Every response is delayed by `delay` seconds, standing in for the latency of the API"""
+  server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+  server.daemon_threads = True
+  server.delay = delay
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  return f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def best(fn, number, repeat=5) -> float:
+  """Returns the best time of `repeat` runs of `number` calls to `fn`, per call in microseconds"""
+  import timeit
+  return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
@@ -0,0 +1,43 @@
+"""
+Compares sending a batch of queries one after the other to Client.batch_query, ordered and unordered.
+The local server delays every response, standing in for the latency of the API.
+
+  python benchmarks/bench_batch.py
+"""
+import time
+
+from _fixtures import serve
+
+from wolfram import Client
+from wolfram.api import ShortAPI
+
+N = 200
+DELAY = 0.02
+WORKERS = [4, 16, 32]
+
+
+def main():
+  base_url = serve(delay=DELAY)
+  inputs = [f"q{i}" for i in range(N)]
+
+  with Client("x", max_workers=max(WORKERS)) as client:
+    start = time.perf_counter()
+    for input in inputs:
+      client.query(ShortAPI, url=base_url, i=input)
+    serial = time.perf_counter() - start
+    print(f"serial: {N / serial:7.1f} queries/s")
+
+    for workers in WORKERS:
+      for ordered in (True, False):
+        start = time.perf_counter()
+        for result in client.batch_query(ShortAPI, inputs, max_workers=workers, ordered=ordered, url=base_url):
+          result.unwrap()
+        elapsed = time.perf_counter() - start
+        print(
+          f"batch_query(max_workers={workers:>2}, ordered={ordered!s:<5}): "
+          f"{N / elapsed:7.1f} queries/s  ({serial / elapsed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,64 @@
+"""
+Compares decoding FullResults with the decoders generated per model class to constructing every model
+through its dataclass __init__ and __post_init__, then measures dispatching warnings
+
+  python benchmarks/bench_decoder.py
+"""
+import json
+from contextlib import contextmanager
+from functools import partial
+
+from _fixtures import SHAPES, best, make_payloads
+
+from wolfram.models import FullResults, Model, Warning
+
+WARNINGS = [
+  {"text": "Interpreting", "word": "pii", "suggestion": "pi"},
+  {"text": "Translating", "phrase": "bonjour", "trans": "hello", "lang": "French"},
+  {
+    "text": "Using closest",
+    "new": "pi",
+    "level": "high",
+    "score": "0.5",
+    "alternative": {"level": "low", "val": "p", "score": "0.2"}
+  },
+  {"text": "An attempt was made to fix mismatched parentheses"}
+]
+
+
+def construct(cls, raw):
+  """Decodes a model the way from_dict did before decoders were generated, going through the fields
+  of the model and their metadata in __post_init__ for every instance"""
+  return cls(_raw=raw, **{k: v for k, v in raw.items() if k in cls.__dataclass_fields__})
+
+
+@contextmanager
+def constructed():
+  """Makes from_dict construct every model, nested ones included, instead of using its decoder"""
+  decoder = Model.__dict__["_decoder"]
+  Model._decoder = classmethod(lambda cls, lazy=False: partial(construct, cls))
+  try:
+    yield
+  finally:
+    Model._decoder = decoder
+
+
+def main():
+  for raw, (pods, subpods) in zip((json.loads(p)["queryresult"] for p in make_payloads()), SHAPES):
+    generated = best(lambda: FullResults.from_dict(raw), 20)
+    expected = FullResults.from_dict(raw).details
+    with constructed():
+      assert FullResults.from_dict(raw).details == expected
+      init = best(lambda: FullResults.from_dict(raw), 20)
+    print(
+      f"{pods:4d} pods of {subpods} subpods: generated {generated:9.1f} us  "
+      f"__init__ {init:9.1f} us  ({init / generated:.1f}x)"
+    )
+
+  dispatched = best(lambda: [Warning.to_subclass(warning) for warning in WARNINGS], 2000)
+  names = [type(Warning.to_subclass(warning)).__name__ for warning in WARNINGS]
+  print(f"{len(WARNINGS)} warnings: {dispatched:.2f} us {names}")
+
+
+if __name__ == "__main__":
+  main()
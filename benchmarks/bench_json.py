@@ -0,0 +1,41 @@
+"""
+Compares the JSON backends responses can be decoded with, on their own and when formatting a FullResults response
+
+  python benchmarks/bench_json.py
+"""
+from requests.models import Response
+
+from _fixtures import best, make_payloads
+
+from wolfram.api import FullResultsAPI
+from wolfram.decoder import BACKENDS, get_loads
+
+N = 20
+
+
+def response(payload: bytes) -> Response:
+  resp = Response()
+  resp._content = payload
+  resp.status_code = 200
+  resp.headers["Content-Type"] = "application/json"
+  return resp
+
+
+def main():
+  backends = {}
+  for name in BACKENDS:
+    try:
+      backends[name] = get_loads(name)
+    except ImportError:
+      print(f"{name} is not installed")
+
+  for payload in make_payloads():
+    times = {"resp.json()": best(lambda: response(payload).json(), N)}
+    for name, loads in backends.items():
+      times[name] = best(lambda: loads(payload), N)
+      times[f"format {name}"] = best(lambda: FullResultsAPI.format_results(response(payload), loads), N)
+    print(f"{len(payload) / 1024:4.0f} KiB  " + "  ".join(f"{k} {v:.0f} us" for k, v in times.items()))
+
+
+if __name__ == "__main__":
+  main()
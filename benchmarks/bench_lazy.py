@@ -0,0 +1,42 @@
+"""
+Compares decoding FullResults up front to decoding them lazily, depending on how much of them is used,
+for generated responses and for the corpus of responses in benchmarks/responses
+
+  python benchmarks/bench_lazy.py
+"""
+import json
+
+from _fixtures import SHAPES, best, load_responses, make_payloads
+
+from wolfram.models import FullResults, Model
+
+N = 30
+
+
+def compare(raws):
+  uses = {
+    "top level": lambda result: (result.success, result.numpods),
+    "primary pod": lambda result: result.primary,
+    "every pod": lambda result: result.details
+  }
+  for name, use in uses.items():
+    times = []
+    for lazy in (False, True):
+      Model.lazy = lazy
+      times.append(best(lambda: [use(FullResults.from_dict(raw)) for raw in raws], N) / len(raws))
+    Model.lazy = False
+    eager, lazy = times
+    print(f"{name:12s} eager {eager:8.1f} us  lazy {lazy:8.1f} us  ({eager / lazy:.1f}x)")
+
+
+def main():
+  print("generated, pods per result:", [n for n, _ in SHAPES])
+  compare([json.loads(payload)["queryresult"] for payload in make_payloads()])
+
+  responses = load_responses()
+  print("\ncorpus:", ", ".join(responses))
+  compare(list(responses.values()))
+
+
+if __name__ == "__main__":
+  main()
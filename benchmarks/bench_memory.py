@@ -0,0 +1,55 @@
+"""
+Measures the memory held by cached FullResults, with models keeping their raw dictionary,
+decoded lazily, or dropping the raw dictionary once decoded
+
+  python benchmarks/bench_memory.py
+"""
+import gc
+import json
+import tracemalloc
+
+from _fixtures import make_payloads
+
+from wolfram.cache import MemoryCache
+from wolfram.models import FullResults, Model
+
+N = 200
+SHAPES = {
+  "typical": [(5, 1), (8, 2), (10, 1), (12, 3), (6, 2)],
+  "large": [(60, 3)]
+}
+MODES = {
+  "default": {},
+  "lazy": {"lazy": True},
+  "compact": {"keep_raw": False}
+}
+
+
+def measure(payloads):
+  cache = MemoryCache(max_size=2**40)
+  gc.collect()
+  tracemalloc.start()
+  before = tracemalloc.get_traced_memory()[0]
+  for i in range(N):
+    result = FullResults.from_dict(json.loads(payloads[i % len(payloads)])["queryresult"])
+    result.primary # A typical use of a result
+    cache.set(f"k{i}", result)
+  gc.collect()
+  after = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+  return (after - before) / N, cache.stats.size / N
+
+
+def main():
+  for name, shapes in SHAPES.items():
+    payloads = make_payloads(shapes)
+    for mode, options in MODES.items():
+      for option, value in options.items():
+        setattr(Model, option, value)
+      traced, estimated = measure(payloads)
+      Model.lazy, Model.keep_raw = False, True
+      print(f"{name:8s} {mode:8s} {traced:10.0f} B/result  (sizeof {estimated:10.0f})")
+
+
+if __name__ == "__main__":
+  main()
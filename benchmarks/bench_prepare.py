@@ -0,0 +1,35 @@
+"""
+Compares building the url of every query to reusing a prepared query
+
+  python benchmarks/bench_prepare.py
+"""
+from _fixtures import best
+
+from wolfram import Client, MemoryCache, Units
+from wolfram.api import FullResultsAPI, ShortAPI
+
+N = 100000
+CASES = [
+  (ShortAPI, {}),
+  (ShortAPI, {"units": Units.METRIC, "ip": "1.2.3.4"}),
+  (FullResultsAPI, {"format": "plaintext", "podtimeout": 2, "units": "metric"})
+]
+
+
+def main():
+  client = Client("x", cache=MemoryCache())
+  for api, params in CASES:
+    prepared = client.prepare(api, **params)
+    built = best(lambda: client._build_url(api, None, {**params, api.INPUT: "population of france"}), N)
+    reused = best(lambda: prepared.url("population of france"), N)
+    print(f"{api.__name__} with {len(params)} fixed parameters: built {built:.2f} us, prepared {reused:.2f} us")
+
+  # Cached queries only pay for their url and the cache lookup
+  client.cache.set(prepared.url("pi"), "cached")
+  queried = best(lambda: client.query(api, input="pi", **params), N)
+  reused = best(lambda: prepared("pi"), N)
+  print(f"cached query: {queried:.2f} us, prepared: {reused:.2f} us")
+
+
+if __name__ == "__main__":
+  main()
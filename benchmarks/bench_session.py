@@ -0,0 +1,37 @@
+"""
+Compares sending queries with a new connection each time to the pooled keep-alive session of Client.
+The local server is plain HTTP, so the gap is far wider against the API, over TLS and a real network.
+
+  python benchmarks/bench_session.py
+"""
+import time
+
+import requests
+from _fixtures import serve
+
+from wolfram import Client
+from wolfram.api import ShortAPI
+
+N = 300
+
+
+def main():
+  base_url = serve()
+
+  start = time.perf_counter()
+  for _ in range(N):
+    with requests.Session() as session:
+      session.get(base_url + "v1/result?appid=x&i=pi").text
+  cold = time.perf_counter() - start
+
+  with Client("x") as client:
+    start = time.perf_counter()
+    for _ in range(N):
+      client.query(ShortAPI, url=base_url, i="pi")
+    warm = time.perf_counter() - start
+
+  print(f"new connection: {cold / N * 1e3:.2f} ms/query   pooled Client: {warm / N * 1e3:.2f} ms/query")
+
+
+if __name__ == "__main__":
+  main()
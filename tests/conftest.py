@@ -0,0 +1,126 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote_plus, urlparse
+
+import pytest
+
+from factories import make_full_results
+
+
+INVALID_APPID = {
+  "queryresult": {
+    "success": False,
+    "error": {"code": "1", "msg": "Invalid appid"},
+    "numpods": 0,
+    "datatypes": "",
+    "timedout": "",
+    "timedoutpods": "",
+    "timing": 0.1,
+    "parsetiming": 0.0,
+    "parsetimedout": False,
+    "recalculate": "",
+    "id": "",
+    "host": "",
+    "server": "1",
+    "related": "",
+    "version": "2.6"
+  }
+}
+
+
+class WolframStub(BaseHTTPRequestHandler):
+  """A local stand-in for the Wolfram|Alpha API
+
+  App IDs starting with `bad` are rejected, inputs starting with `junk` cannot be
+  interpreted, and every other query is answered. `server.status` forces the status
+  code of every response, `server.delay` delays every response by that many seconds,
+  and each query is recorded in `server.queries`. Asynchronous FullResults queries
+  have their odd pods deferred to `/pod`.
+  """
+  protocol_version = "HTTP/1.1"
+
+  def log_message(self, *args):
+    pass
+
+  def respond(self, code, body, content_type="text/plain"):
+    self.send_response(code)
+    self.send_header("Content-Type", content_type)
+    self.send_header("Content-Length", str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def do_GET(self):
+    url = urlparse(self.path)
+    query = {k: v if len(v) > 1 else v[0] for k, v in parse_qs(url.query).items()}
+    self.server.queries.append((url.path, query))
+    input = query.get("input", query.get("i", ""))
+    if self.server.delay:
+      time.sleep(self.server.delay)
+
+    if self.server.status is not None:
+      return self.respond(self.server.status, b"Service Unavailable")
+
+    if query.get("appid", "").startswith("bad"):
+      if url.path.endswith("/query"):
+        return self.respond(200, json.dumps(INVALID_APPID).encode(), "application/json")
+      return self.respond(403, b"Error 1: Invalid appid")
+
+    if url.path.endswith("/query"):
+      raw = make_full_results(input)
+      if input.startswith("junk"):
+        # Inputs that cannot be interpreted give a fallthrough result
+        raw["queryresult"].update(success=False, numpods=0)
+        del raw["queryresult"]["pods"]
+      if float(query.get("scantimeout", 3)) < 1:
+        # Timeouts lowered to fit a deadline leave some pods out
+        raw["queryresult"]["pods"] = raw["queryresult"]["pods"][:2]
+        raw["queryresult"]["timedout"] = "Data"
+        raw["queryresult"]["timedoutpods"] = "Pod 2,Pod 3"
+      if "async" in query:
+        host = self.headers["Host"]
+        for pod in raw["queryresult"].get("pods", [])[1::2]:
+          pod["async"] = f"http://{host}/pod?input={quote_plus(input)}&id={pod['id']}"
+          pod["subpods"] = []
+      return self.respond(200, json.dumps(raw).encode(), "application/json")
+    elif url.path == "/pod":
+      pods = make_full_results(input)["queryresult"]["pods"]
+      pod = next(pod for pod in pods if pod["id"] == query["id"])
+      return self.respond(200, json.dumps(pod).encode(), "application/json")
+    elif url.path.endswith("/conversation.jsp"):
+      if input.startswith("junk"):
+        body = {"error": "No result is available"}
+      else:
+        body = {"result": f"answer to {input}", "conversationID": "c1", "host": "www6b3.wolframalpha.com", "s": "1"}
+      return self.respond(200, json.dumps(body).encode(), "application/json")
+    elif input.startswith("junk"):
+      return self.respond(501, b"Wolfram|Alpha did not understand your input")
+    return self.respond(200, f"answer to {input}".encode())
+
+
+@pytest.fixture
+def raw_full_results():
+  """The raw query result of a successful FullResults query"""
+  return make_full_results("pi", npods=6, nsub=2)["queryresult"]
+
+
+@pytest.fixture(scope="session")
+def _stub_server():
+  server = ThreadingHTTPServer(("127.0.0.1", 0), WolframStub)
+  server.daemon_threads = True
+  thread = threading.Thread(target=server.serve_forever, daemon=True)
+  thread.start()
+  yield server
+  server.shutdown()
+  server.server_close()
+
+
+@pytest.fixture
+def stub(_stub_server):
+  """The stub server, reset for every test"""
+  _stub_server.queries = []
+  _stub_server.status = None
+  _stub_server.delay = 0
+  _stub_server.base_url = f"http://127.0.0.1:{_stub_server.server_address[1]}/"
+  return _stub_server
@@ -0,0 +1,71 @@
+"""
+Generated API responses, shared by the tests and the benchmarks
+"""
+
+
+def make_full_results(input="pi", npods=4, nsub=2):
+  """Returns the raw response of a successful FullResults query, with `npods` pods of `nsub` subpods each"""
+  pods = [
+    {
+      "title": f"Pod {p}",
+      "scanner": "Identity",
+      "id": f"Pod{p}",
+      "position": (p + 1) * 100,
+      "error": False,
+      "numsubpods": nsub,
+      "primary": p == 1,
+      "subpods": [
+        {
+          "title": "",
+          "plaintext": f"{input} {p}.{s}",
+          "img": {
+            "src": "https://www6b3.wolframalpha.com/Calculate/MSP/MSP1?MSPStoreType=image/gif&s=13",
+            "alt": "alt",
+            "title": "title",
+            "width": 100,
+            "height": 20,
+            "type": "Default",
+            "themes": "1,2,3,4,5,6,7,8,9,10,11,12",
+            "colorinvertable": True,
+            "contenttype": "image/gif"
+          }
+        }
+        for s in range(nsub)
+      ],
+      "expressiontypes": {"name": "Default"}
+    }
+    for p in range(npods)
+  ]
+  return {
+    "queryresult": {
+      "success": True,
+      "error": False,
+      "numpods": npods,
+      "datatypes": "",
+      "timedout": "",
+      "timedoutpods": "",
+      "timing": 1.2,
+      "parsetiming": 0.3,
+      "parsetimedout": False,
+      "recalculate": "",
+      "id": "MSP123",
+      "host": "https://www6b3.wolframalpha.com",
+      "server": "7",
+      "related": "",
+      "version": "2.6",
+      "inputstring": input,
+      "pods": pods,
+      "assumptions": {
+        "type": "Clash",
+        "word": "pi",
+        "template": "Assuming \"${word}\" is ${desc1}. Use as ${desc2} instead",
+        "count": 2,
+        "values": [
+          {"name": "a", "desc": "a number", "input": "*C.pi-_*x"},
+          {"name": "b", "desc": "a movie", "input": "*C.pi-_*y"}
+        ]
+      },
+      "sources": [{"url": "https://www.wolframalpha.com/sources/a.html", "text": "A"}],
+      "warnings": {"text": "Interpreting", "word": "pii", "suggestion": "pi"}
+    }
+  }
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from wolfram import AsyncClient, Client
+from wolfram.api import ShortAPI
+from wolfram.exceptions import InterpretationError
+
+
+@pytest.fixture
+def client(stub):
+  client = Client("good")
+  client.BASE_URL = stub.base_url
+  with client:
+    yield client
+
+
+def test_results_are_in_input_order(stub, client):
+  stub.delay = 0.01
+  inputs = [f"q{i}" for i in range(20)]
+  results = list(client.batch_query(ShortAPI, inputs, max_workers=4))
+  assert [result.index for result in results] == list(range(20))
+  assert [result.unwrap() for result in results] == [f"answer to {input}" for input in inputs]
+
+
+def test_unordered_results_cover_every_input(stub, client):
+  inputs = [f"q{i}" for i in range(20)]
+  results = list(client.batch_query(ShortAPI, inputs, max_workers=4, ordered=False))
+  assert sorted(result.index for result in results) == list(range(20))
+  assert all(result.result == f"answer to {result.input}" for result in results)
+
+
+def test_failures_are_stored_on_their_result(client):
+  results = list(client.batch_query(ShortAPI, ["pi", "junk", {"i": "e"}]))
+  assert [result.ok for result in results] == [True, False, True]
+  assert isinstance(results[1].exception, InterpretationError)
+  with pytest.raises(InterpretationError):
+    results[1].unwrap()
+  assert results[2].result == "answer to e"
+
+
+def test_inputs_are_pulled_lazily(client):
+  pulled = []
+
+  def inputs():
+    for i in range(100):
+      pulled.append(i)
+      yield f"q{i}"
+
+  results = client.batch_query(ShortAPI, inputs(), max_workers=3)
+  assert pulled == []
+  next(results)
+  assert len(pulled) <= 4
+  results.close()
+  assert len(pulled) <= 4
+
+
+def run_async(stub, consume):
+  async def main():
+    async with AsyncClient("good") as client:
+      client.BASE_URL = stub.base_url
+      return await consume(client)
+
+  return asyncio.run(main())
+
+
+def test_map_yields_in_input_order(stub):
+  stub.delay = 0.01
+  inputs = [f"q{i}" for i in range(20)]
+
+  async def consume(client):
+    return [result async for result in client.map(ShortAPI, inputs, max_concurrency=4)]
+
+  assert run_async(stub, consume) == [f"answer to {input}" for input in inputs]
+
+
+def test_map_yields_exceptions_in_place(stub):
+  async def consume(client):
+    return [result async for result in client.map(ShortAPI, ["pi", "junk", "e"])]
+
+  first, failure, last = run_async(stub, consume)
+  assert (first, last) == ("answer to pi", "answer to e")
+  assert isinstance(failure, InterpretationError)
+
+
+def test_as_completed_takes_async_iterables(stub):
+  async def inputs():
+    for i in range(10):
+      yield f"q{i}"
+
+  async def consume(client):
+    return [result async for result in client.as_completed(ShortAPI, inputs(), max_concurrency=3)]
+
+  results = run_async(stub, consume)
+  assert sorted(result.index for result in results) == list(range(10))
+  assert all(result.result == f"answer to {result.input}" for result in results)
+
+
+@pytest.mark.parametrize("method", ["map", "as_completed"])
+def test_inputs_are_pulled_up_to_max_concurrency(stub, method):
+  stub.delay = 0.05
+  pulled = []
+
+  async def inputs():
+    for i in range(100):
+      pulled.append(i)
+      yield f"q{i}"
+
+  async def consume(client):
+    results = getattr(client, method)(ShortAPI, inputs(), max_concurrency=3)
+    await results.__anext__()
+    ahead = len(pulled)
+    await results.aclose()
+    return ahead
+
+  assert run_async(stub, consume) <= 3
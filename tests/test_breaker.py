@@ -0,0 +1,44 @@
+import pytest
+
+from wolfram import Client, CircuitBreaker, CircuitState
+from wolfram.exceptions import CircuitOpen, DeadlineExceeded
+
+
+def test_opens_after_failures():
+  breaker = CircuitBreaker(window=4, min_calls=4)
+  for _ in range(4):
+    breaker.record("e", False, 0.1, breaker.before("e"))
+  assert breaker.state("e") is CircuitState.OPEN
+  with pytest.raises(CircuitOpen):
+    breaker.before("e")
+
+
+def test_ignores_calls_started_before_a_transition():
+  breaker = CircuitBreaker(window=2, min_calls=2, open_duration=0)
+  straggler = breaker.before("e")
+  for _ in range(2):
+    breaker.record("e", False, 0.1, breaker.before("e"))
+  probe = breaker.before("e")
+  assert breaker.state("e") is CircuitState.HALF_OPEN
+
+  # A request sent while the circuit was closed neither frees nor completes the probe
+  breaker.record("e", True, 0.1, straggler)
+  breaker.release("e", straggler)
+  assert breaker.state("e") is CircuitState.HALF_OPEN
+  with pytest.raises(CircuitOpen):
+    breaker.before("e")
+
+  breaker.record("e", True, 0.1, probe)
+  assert breaker.state("e") is CircuitState.CLOSED
+
+
+def test_deadline_timeouts_are_neutral(stub):
+  breaker = CircuitBreaker(window=2, min_calls=2)
+  client = Client("good", circuit_breaker=breaker)
+  client.BASE_URL = stub.base_url
+  stub.delay = 0.5
+  with client:
+    for _ in range(3):
+      with pytest.raises(DeadlineExceeded):
+        client.short_query("pi", deadline=0.1)
+  assert breaker.states == {f"{stub.base_url}v1/result": CircuitState.CLOSED}
@@ -0,0 +1,181 @@
+import asyncio
+import time
+
+import pytest
+
+from wolfram import AsyncClient, Client, MemoryCache, SQLiteCache
+from wolfram.cache import NegativeResult, sizeof
+from wolfram.exceptions import InterpretationError
+
+
+def make_client(stub, cache=None, **kwargs):
+  client = Client("good", cache=MemoryCache() if cache is None else cache, **kwargs)
+  client.BASE_URL = stub.base_url
+  return client
+
+
+def test_error_responses_are_not_cached(stub):
+  with make_client(stub) as client:
+    stub.status = 503
+    client.short_query("pi")
+    assert len(client.cache) == 0
+    stub.status = None
+    assert client.short_query("pi") == "answer to pi"
+    assert client.short_query("pi") == "answer to pi"
+  assert len(stub.queries) == 2
+
+
+def test_invalid_appid_is_not_cached(stub):
+  client = Client("bad", cache=MemoryCache())
+  client.BASE_URL = stub.base_url
+  with client:
+    assert client.full_results_query("pi").is_error
+  assert len(client.cache) == 0
+
+
+def test_results_cut_short_by_a_deadline_are_not_cached(stub):
+  with make_client(stub) as client:
+    assert not client.full_results_query("pi", deadline=0.5).is_complete
+    assert len(client.cache) == 0
+    assert client.full_results_query("pi").is_complete
+    # A complete result is served to queries with a deadline too
+    assert client.full_results_query("pi", deadline=0.5).is_complete
+  assert len(stub.queries) == 2
+
+
+def test_memory_cache_evicts_least_recently_used():
+  cache = MemoryCache(max_size=sizeof("x" * 100) * 3)
+  for key in "abc":
+    cache.set(key, "x" * 100)
+  cache.lookup("a")
+  cache.set("d", "x" * 100)
+  assert [key for key in "abcd" if cache.lookup(key)[0] is not None] == ["a", "c", "d"]
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+  cache = SQLiteCache(str(tmp_path / "cache.db"), max_size=1000, sweep_interval=None)
+  yield cache
+  cache.close()
+
+
+def test_sqlite_cache_size_counts_replaced_and_deleted_results(sqlite_cache):
+  for _ in range(3):
+    sqlite_cache.set("a", "x" * 100)
+  assert sqlite_cache._size == sqlite_cache.stats.size == 100
+  sqlite_cache.delete("a")
+  assert sqlite_cache._size == sqlite_cache.stats.size == 0
+
+
+def test_sqlite_cache_evicts_to_low_water_mark(sqlite_cache):
+  for i in range(10):
+    sqlite_cache.set(f"k{i}", "x" * 100)
+  sqlite_cache.lookup("k0")
+  sqlite_cache.set("k10", "x" * 100)
+  stats = sqlite_cache.stats
+  assert stats.size <= 900
+  assert stats.evictions == 2
+  assert sqlite_cache.lookup("k0")[0] is not None
+  assert sqlite_cache.lookup("k1")[0] is None
+
+
+def test_negative_results_do_not_keep_tracebacks():
+  try:
+    raise InterpretationError("input was unable to be interpreted by the API")
+  except InterpretationError as e:
+    negative = NegativeResult(exception=e)
+    assert e.__traceback__ is not None
+  assert negative.exception.__traceback__ is None
+  with pytest.raises(InterpretationError, match="unable to be interpreted"):
+    negative.replay()
+
+
+def test_stale_result_is_refreshed_once(stub):
+  cache = MemoryCache(ttl=0.05, stale_ttl=10)
+  with make_client(stub, cache) as client:
+    client.short_query("pi")
+    time.sleep(0.1)
+    stub.delay = 0.2
+    start = time.monotonic()
+    assert [client.short_query("pi") for _ in range(3)] == ["answer to pi"] * 3
+    assert time.monotonic() - start < 0.2
+  assert cache.stats.stale_hits == 3
+  assert len(stub.queries) == 2
+
+
+def test_stale_result_is_served_while_refresh_fails(stub):
+  cache = MemoryCache(ttl=0.05, stale_ttl=10)
+  with make_client(stub, cache) as client:
+    client.short_query("pi")
+    time.sleep(0.1)
+    stub.status = 503
+    assert client.short_query("pi") == "answer to pi"
+    time.sleep(0.1)
+    assert client.short_query("pi") == "answer to pi"
+  assert cache.stats.stale_hits == 2
+  assert len(stub.queries) == 3
+
+
+def test_stale_result_is_a_miss_once_expired(stub):
+  cache = MemoryCache(ttl=0.05, stale_ttl=0.05)
+  with make_client(stub, cache) as client:
+    client.short_query("pi")
+    time.sleep(0.15)
+    client.short_query("pi")
+  assert (cache.stats.misses, cache.stats.stale_hits) == (2, 0)
+  assert len(stub.queries) == 2
+
+
+def run_async(stub, cache, steps):
+  async def main():
+    async with AsyncClient("good", cache=cache) as client:
+      client.BASE_URL = stub.base_url
+      return await steps(client)
+
+  return asyncio.run(main())
+
+
+def test_async_stale_result_is_refreshed_once(stub):
+  cache = MemoryCache(ttl=0.05, stale_ttl=10)
+
+  async def steps(client):
+    await client.short_query("pi")
+    await asyncio.sleep(0.1)
+    stub.delay = 0.2
+    start = time.monotonic()
+    results = [await client.short_query("pi") for _ in range(3)]
+    return results, time.monotonic() - start
+
+  results, elapsed = run_async(stub, cache, steps)
+  assert results == ["answer to pi"] * 3 and elapsed < 0.2
+  assert cache.stats.stale_hits == 3
+  assert len(stub.queries) == 2
+
+
+def test_async_stale_result_is_served_while_refresh_fails(stub):
+  cache = MemoryCache(ttl=0.05, stale_ttl=10)
+
+  async def steps(client):
+    await client.short_query("pi")
+    await asyncio.sleep(0.1)
+    stub.status = 503
+    first = await client.short_query("pi")
+    await asyncio.sleep(0.1)
+    return [first, await client.short_query("pi")]
+
+  assert run_async(stub, cache, steps) == ["answer to pi"] * 2
+  assert cache.stats.stale_hits == 2
+  assert len(stub.queries) == 3
+
+
+def test_async_stale_result_is_a_miss_once_expired(stub):
+  cache = MemoryCache(ttl=0.05, stale_ttl=0.05)
+
+  async def steps(client):
+    await client.short_query("pi")
+    await asyncio.sleep(0.15)
+    await client.short_query("pi")
+
+  run_async(stub, cache, steps)
+  assert (cache.stats.misses, cache.stats.stale_hits) == (2, 0)
+  assert len(stub.queries) == 2
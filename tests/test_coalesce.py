@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from wolfram import AsyncClient
+from wolfram.exceptions import DeadlineExceeded
+
+
+def test_concurrent_queries_share_a_request(stub):
+  stub.delay = 0.1
+
+  async def main():
+    async with AsyncClient("good") as client:
+      client.BASE_URL = stub.base_url
+      return await asyncio.gather(*(client.short_query("pi") for _ in range(3)))
+
+  assert asyncio.run(main()) == ["answer to pi"] * 3
+  assert len(stub.queries) == 1
+
+
+def test_queries_with_a_deadline_are_not_shared(stub):
+  stub.delay = 0.3
+
+  async def main():
+    async with AsyncClient("good") as client:
+      client.BASE_URL = stub.base_url
+      leader = asyncio.ensure_future(client.short_query("pi", deadline=0.1))
+      await asyncio.sleep(0)
+      follower = asyncio.ensure_future(client.short_query("pi"))
+      with pytest.raises(DeadlineExceeded):
+        await leader
+      assert await follower == "answer to pi"
+
+  asyncio.run(main())
+  # The query with a deadline had the timeout of the API lowered to it, the other did not
+  assert sorted(query.get("timeout", "") for _, query in stub.queries) == ["", "0.1"]
+
+
+def test_cancelled_query_does_not_cancel_shared_request(stub):
+  stub.delay = 0.2
+
+  async def main():
+    async with AsyncClient("good") as client:
+      client.BASE_URL = stub.base_url
+      first = asyncio.ensure_future(client.short_query("pi"))
+      await asyncio.sleep(0)
+      second = asyncio.ensure_future(client.short_query("pi"))
+      await asyncio.sleep(0.05)
+      first.cancel()
+      assert await second == "answer to pi"
+
+  asyncio.run(main())
+  assert len(stub.queries) == 1
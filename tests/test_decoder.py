@@ -0,0 +1,48 @@
+import json
+import sys
+
+import pytest
+
+from wolfram import Client, decoder
+
+PAYLOAD = b'{"queryresult": {"success": true, "numpods": 2}}'
+
+
+@pytest.mark.parametrize("backend", list(decoder.BACKENDS))
+def test_backends_decode_the_same(backend):
+  try:
+    loads = decoder.get_loads(backend)
+  except ImportError:
+    pytest.skip(f"{backend} is not installed")
+  assert loads(PAYLOAD) == json.loads(PAYLOAD)
+
+
+def test_unknown_backend():
+  with pytest.raises(ValueError):
+    decoder.get_loads("yaml")
+
+
+def test_missing_backend(monkeypatch):
+  monkeypatch.setitem(sys.modules, "msgspec", None)
+  with pytest.raises(ImportError):
+    decoder.get_loads("msgspec")
+
+
+def test_fastest_installed_backend_is_picked(monkeypatch):
+  monkeypatch.setitem(sys.modules, "orjson", None)
+  monkeypatch.setitem(sys.modules, "msgspec", None)
+  assert decoder.get_loads() is json.loads
+
+
+def test_client_decodes_with_given_backend(stub):
+  calls = []
+
+  def loads(data):
+    calls.append(data)
+    return json.loads(data)
+
+  client = Client("good", json_loads=loads)
+  client.BASE_URL = stub.base_url
+  with client:
+    assert client.full_results_query("pi").success
+  assert len(calls) == 1
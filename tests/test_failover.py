@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from wolfram import AppIDPool, AsyncClient, Client
+from wolfram.exceptions import InterpretationError, InvalidAppID
+
+
+def appids(stub):
+  return [query["appid"] for _, query in stub.queries]
+
+
+@pytest.mark.parametrize("method", ["short_query", "spoken_query", "conversational_query"])
+def test_fails_over_invalid_appid(stub, method):
+  client = Client(AppIDPool(["bad", "good"]))
+  client.BASE_URL = stub.base_url
+  with client:
+    getattr(client, method)("pi")
+    getattr(client, method)("e")
+  assert appids(stub) == ["bad", "good", "good"]
+
+
+@pytest.mark.parametrize("method", ["short_query", "spoken_query", "conversational_query"])
+def test_async_fails_over_invalid_appid(stub, method):
+  async def main():
+    async with AsyncClient(AppIDPool(["bad", "good"])) as client:
+      client.BASE_URL = stub.base_url
+      await getattr(client, method)("pi")
+      await getattr(client, method)("e")
+
+  asyncio.run(main())
+  assert appids(stub) == ["bad", "good", "good"]
+
+
+@pytest.mark.parametrize("method", ["spoken_query", "conversational_query"])
+def test_async_raises_invalid_appid(stub, method):
+  async def main():
+    async with AsyncClient("bad") as client:
+      client.BASE_URL = stub.base_url
+      await getattr(client, method)("pi")
+
+  with pytest.raises(InvalidAppID):
+    asyncio.run(main())
+
+
+def test_async_conversational_interpretation_error(stub):
+  async def main():
+    async with AsyncClient("good") as client:
+      client.BASE_URL = stub.base_url
+      await client.conversational_query("junk")
+
+  with pytest.raises(InterpretationError):
+    asyncio.run(main())
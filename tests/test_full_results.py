@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from wolfram import AsyncClient, Client, Units
+
+
+@pytest.fixture
+def client(stub):
+  client = Client("good")
+  client.BASE_URL = stub.base_url
+  with client:
+    yield client
+
+
+def sent(stub):
+  _, query = stub.queries[-1]
+  return query
+
+
+def test_sequences_are_comma_separated(stub, client):
+  client.full_results_query("pi", format=["plaintext", "image"], podindex=[1, 2])
+  assert sent(stub)["format"] == "plaintext,image"
+  assert sent(stub)["podindex"] == "1,2"
+
+
+def test_single_format(stub, client):
+  client.full_results_query("pi", format="plaintext")
+  assert sent(stub)["format"] == "plaintext"
+
+
+def test_imperial_units(stub, client):
+  client.full_results_query("pi", units=Units.IMPERIAL)
+  assert sent(stub)["units"] == "nonmetric"
+
+
+def test_async_pods_are_drained_on_close(stub):
+  stub.delay = 0.2
+
+  async def main():
+    client = AsyncClient("good")
+    client.BASE_URL = stub.base_url
+    task = asyncio.ensure_future(client.full_results_pods("pi", ["Pod1"]))
+    await asyncio.sleep(0.05)
+    await client.aclose()
+    return task.done() and task.exception() is None
+
+  assert asyncio.run(main())
+
+
+def test_latency_budget_is_split_into_timeouts(stub, client):
+  client.full_results_query("pi", latency_budget=2)
+  client.full_results_pods("pi", ["Pod1"], latency_budget=2)
+  for _ in client.full_results_stream("pi", latency_budget=2):
+    pass
+  for path, query in stub.queries:
+    if path == "/pod":
+      continue
+    assert "latency_budget" not in query
+    assert float(query["totaltimeout"]) <= 2
+
+
+def test_deferred_pods_are_merged(stub, client):
+  results = [
+    ([pod.id for pod in result.pods], [pod.text for pod in result.pods if not pod.is_deferred])
+    for result in client.full_results_stream("pi")
+  ]
+  assert len(results) == 3
+  assert all(ids == ["Pod0", "Pod1", "Pod2", "Pod3"] for ids, _ in results)
+  assert results[0][1] == ["pi 0.0", "pi 2.0"]
+  assert results[-1][1] == ["pi 0.0", "pi 1.0", "pi 2.0", "pi 3.0"]
+
+
+def test_async_deferred_pods_are_merged(stub):
+  async def main():
+    async with AsyncClient("good") as client:
+      client.BASE_URL = stub.base_url
+      return [
+        ([pod.id for pod in result.pods], [pod.text for pod in result.pods if not pod.is_deferred])
+        async for result in client.full_results_stream("pi")
+      ]
+
+  results = asyncio.run(main())
+  assert len(results) == 3
+  assert all(ids == ["Pod0", "Pod1", "Pod2", "Pod3"] for ids, _ in results)
+  assert results[0][1] == ["pi 0.0", "pi 2.0"]
+  assert results[-1][1] == ["pi 0.0", "pi 1.0", "pi 2.0", "pi 3.0"]
+
+
+def test_paused_stream_does_not_block_close(stub):
+  async def main():
+    client = AsyncClient("good")
+    client.BASE_URL = stub.base_url
+    stream = client.full_results_stream("pi")
+    await stream.__anext__()
+    await asyncio.wait_for(client.aclose(), 5)
+    await stream.aclose()
+
+  asyncio.run(main())
@@ -0,0 +1,42 @@
+import pytest
+
+from wolfram import Client, HedgePolicy, TokenBucketLimiter
+from wolfram import client as client_module
+
+
+def test_slow_request_is_hedged(stub):
+  stub.delay = 0.2
+  hedge = HedgePolicy(delay=0.05, budget=1.0)
+  client = Client("good", hedge_policy=hedge)
+  client.BASE_URL = stub.base_url
+  with client:
+    assert client.short_query("pi") == "answer to pi"
+  assert hedge.stats.hedged == 1
+  assert len(stub.queries) == 2
+
+
+def test_hedge_needs_a_rate_limiter_slot(stub):
+  stub.delay = 0.2
+  hedge = HedgePolicy(delay=0.05, budget=1.0)
+  client = Client("good", hedge_policy=hedge, rate_limiter=TokenBucketLimiter(rate=1))
+  client.BASE_URL = stub.base_url
+  with client:
+    assert client.short_query("pi") == "answer to pi"
+  assert hedge.stats.hedged == 0
+  assert len(stub.queries) == 1
+
+
+def test_request_is_sent_inline_until_latencies_are_observed(stub, monkeypatch):
+  def spawn(*args):
+    raise AssertionError("the request was sent from another thread")
+
+  monkeypatch.setattr(client_module, "_spawn", spawn)
+  hedge = HedgePolicy(min_samples=5)
+  client = Client("good", hedge_policy=hedge)
+  client.BASE_URL = stub.base_url
+  with client:
+    for _ in range(5):
+      assert client.short_query("pi") == "answer to pi"
+    with pytest.raises(AssertionError, match="another thread"):
+      client.short_query("pi")
+  assert hedge.stats.requests == 6
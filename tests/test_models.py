@@ -0,0 +1,57 @@
+import copy
+
+import pytest
+
+from wolfram.models import FullResults, Model
+
+
+def summary(result):
+  """The values of a result accessed through its fields and properties"""
+  return (
+    result.success,
+    result.numpods,
+    result.is_error,
+    result.is_complete,
+    result.recalculate,
+    [(pod.id, pod.title, pod.position, [sub.plaintext for sub in pod.subpods]) for pod in result.pods],
+    [sub.img.src.url for pod in result.pods for sub in pod.subpods],
+    result.primary.text,
+    result.details,
+    [type(warning) for warning in result.warnings],
+    [source.url.url for source in result.sources]
+  )
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_lazy_matches_eager(monkeypatch, raw_full_results, lazy):
+  eager = FullResults.from_dict(copy.deepcopy(raw_full_results))
+  monkeypatch.setattr(Model, "lazy", lazy)
+  result = FullResults.from_dict(copy.deepcopy(raw_full_results))
+  assert summary(result) == summary(eager)
+  assert result.raw == raw_full_results
+
+
+def test_lazy_fields_are_decoded_once(monkeypatch, raw_full_results):
+  monkeypatch.setattr(Model, "lazy", True)
+  result = FullResults.from_dict(raw_full_results)
+  assert result.pods is result.pods
+  assert result.pods[0].subpods is result.pods[0].subpods
+
+
+def test_missing_required_field(raw_full_results):
+  del raw_full_results["success"]
+  with pytest.raises(TypeError):
+    FullResults.from_dict(raw_full_results)
+
+
+def test_raw_is_rebuilt_without_keep_raw(monkeypatch, raw_full_results):
+  raw_full_results["unknown"] = {"kept": True}
+  expected = summary(FullResults.from_dict(copy.deepcopy(raw_full_results)))
+  monkeypatch.setattr(Model, "keep_raw", False)
+  result = FullResults.from_dict(raw_full_results)
+  assert result._raw is None
+
+  rebuilt = result.raw
+  assert rebuilt["unknown"] == {"kept": True}
+  assert set(raw_full_results) <= set(rebuilt)
+  assert summary(FullResults.from_dict(rebuilt)) == expected
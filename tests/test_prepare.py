@@ -0,0 +1,42 @@
+import pytest
+
+from wolfram import Client, MemoryCache, Units
+from wolfram.api import FullResultsAPI, ShortAPI
+
+
+@pytest.mark.parametrize("api, params", [
+  (ShortAPI, {}),
+  (ShortAPI, {"units": Units.METRIC}),
+  (FullResultsAPI, {"format": "plaintext", "podtimeout": 2})
+])
+@pytest.mark.parametrize("input", ["population of france", "1+1=2", 42, 1.5])
+def test_prepared_url_matches_query_url(api, params, input):
+  client = Client("good")
+  prepared = client.prepare(api, **params)
+  assert prepared.url(input) == client._build_url(api, None, {**params, api.INPUT: input})
+
+
+@pytest.mark.parametrize("params, sent", [
+  ({"format": ["plaintext", "image"]}, {"format": "plaintext,image"}),
+  ({"units": Units.IMPERIAL}, {"units": "nonmetric"}),
+  ({"podindex": [1, 2], "units": Units.IMPERIAL}, {"podindex": "1,2", "units": "nonmetric"})
+])
+def test_prepared_full_results_share_cache_entries(stub, params, sent):
+  client = Client("good", cache=MemoryCache())
+  client.BASE_URL = stub.base_url
+  with client:
+    client.full_results_query("pi", **params)
+    client.prepare(FullResultsAPI, **params)("pi")
+  assert len(stub.queries) == 1
+  _, query = stub.queries[0]
+  assert {key: query[key] for key in sent} == sent
+
+
+def test_prepared_latency_budget_is_split(stub):
+  client = Client("good")
+  client.BASE_URL = stub.base_url
+  with client:
+    client.prepare(FullResultsAPI, latency_budget=2)("pi")
+  _, query = stub.queries[0]
+  assert "latency_budget" not in query
+  assert float(query["totaltimeout"]) <= 2
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from wolfram import Client, TokenBucketLimiter
+from wolfram.exceptions import DeadlineExceeded
+
+
+def test_burst_then_paced_at_rate():
+  limiter = TokenBucketLimiter(rate=20, burst=3)
+  delays = [limiter.acquire("app") for _ in range(5)]
+  assert delays[:3] == [0.0] * 3
+  assert delays[3] == pytest.approx(0.05, abs=0.01)
+  assert delays[4] == pytest.approx(0.05, abs=0.01)
+  assert limiter.stats.delayed == 2
+
+
+def test_short_timeout_refunds_the_slot():
+  limiter = TokenBucketLimiter(rate=10)
+  limiter.acquire("app")
+  with pytest.raises(DeadlineExceeded):
+    limiter.acquire("app", timeout=0.01)
+  # Without the refund, the next slot would be two intervals away
+  assert limiter.acquire("app") == pytest.approx(0.1, abs=0.02)
+
+
+def test_cancelled_wait_refunds_the_slot():
+  limiter = TokenBucketLimiter(rate=10)
+
+  async def main():
+    limiter.acquire("app")
+    task = asyncio.ensure_future(limiter.async_acquire("app"))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+      await task
+    return await limiter.async_acquire("app")
+
+  assert asyncio.run(main()) == pytest.approx(0.09, abs=0.02)
+
+
+def test_clients_with_the_same_appid_share_a_bucket(stub):
+  limiter = TokenBucketLimiter(rate=20)
+  clients = [Client(appid, rate_limiter=limiter) for appid in ("good", "good", "good2")]
+  for client in clients:
+    client.BASE_URL = stub.base_url
+  for client in clients[:2]:
+    client.short_query("pi")
+    client.short_query("e")
+  clients[2].short_query("pi")
+  for client in clients:
+    client.close()
+  # Only the requests made with the App ID shared by both clients are paced
+  assert limiter.stats.acquired == 5
+  assert limiter.stats.delayed == 3
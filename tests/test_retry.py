@@ -0,0 +1,16 @@
+from wolfram import Client, RetryPolicy
+
+
+def test_retry_after_is_capped():
+  policy = RetryPolicy(backoff_cap=2)
+  assert policy.backoff(1, {"Retry-After": "3600"}) == 2
+  assert policy.backoff(1, {"Retry-After": "1"}) == 1
+
+
+def test_error_responses_are_retried(stub):
+  stub.status = 503
+  client = Client("good", retry_policy=RetryPolicy(max_attempts=2, backoff_base=0.01))
+  client.BASE_URL = stub.base_url
+  with client:
+    client.short_query("pi")
+  assert len(stub.queries) == 2
@@ -0,0 +1,36 @@
+import pytest
+
+from wolfram import Client, MemoryCache, Router
+from wolfram.api import FullResultsAPI, ShortAPI
+from wolfram.exceptions import InterpretationError
+
+
+def make_client(stub):
+  client = Client("good", cache=MemoryCache())
+  client.BASE_URL = stub.base_url
+  return client
+
+
+def test_full_results_tier_shares_cache_keys(stub):
+  with make_client(stub) as client:
+    router = Router(client, [FullResultsAPI])
+    routed = router.query("pi", format=["plaintext", "image"], podindex=[1, 2])
+    assert routed.api is FullResultsAPI
+    client.full_results_query("pi", format=["plaintext", "image"], podindex=[1, 2])
+  assert len(stub.queries) == 1
+
+
+def test_unsuccessful_full_results_escalate(stub):
+  with make_client(stub) as client:
+    router = Router(client, [FullResultsAPI, ShortAPI])
+    with pytest.raises(InterpretationError):
+      router.query("junk")
+  assert router.stats["FullResultsAPI"].escalations == 1
+  assert router.stats["ShortAPI"].requests == 1
+
+
+def test_interpretation_errors_escalate(stub):
+  with make_client(stub) as client:
+    routed = Router(client).query("pi")
+  assert routed.api is ShortAPI
+  assert routed.escalations == 0
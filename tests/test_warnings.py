@@ -0,0 +1,49 @@
+import pytest
+
+from wolfram.models import (
+  FullResults,
+  ReinterpretWarning,
+  SpellCheckWarning,
+  TranslationWarning,
+  Warning
+)
+
+ALTERNATIVE = {"level": "low", "val": "p", "score": "0.1"}
+
+
+@pytest.mark.parametrize("raw, cls", [
+  ({"text": "generic"}, Warning),
+  ({"text": "Delimiters"}, Warning),
+  # Warnings missing a required field of the subclass they look like are left as they are
+  ({"text": "Interpreting", "word": "pii"}, Warning),
+  ({"text": "Translating", "phrase": "bonjour", "lang": "French"}, Warning),
+  ({"text": "Using closest", "new": "pi"}, Warning),
+  ({"text": "Interpreting", "word": "pii", "suggestion": "pi"}, SpellCheckWarning),
+  ({"text": "Translating", "phrase": "bonjour", "trans": "hello", "lang": "French"}, TranslationWarning),
+  ({"text": "Using closest", "new": "pi", "score": "0.5", "level": "medium"}, ReinterpretWarning),
+  (
+    {"text": "Using closest", "new": "pi", "score": "0.5", "level": "medium", "alternative": ALTERNATIVE},
+    ReinterpretWarning
+  )
+])
+def test_dispatch(raw, cls):
+  warning = Warning.to_subclass(raw)
+  assert type(warning) is cls
+  assert warning.raw == raw
+
+
+def test_reinterpret_alternatives():
+  raw = {"text": "Using closest", "new": "pi", "score": "0.5", "level": "medium"}
+  assert Warning.to_subclass(raw).alternative is None
+  warning = Warning.to_subclass({**raw, "alternative": ALTERNATIVE})
+  assert [alt.val for alt in warning.alternative] == ["p"]
+  assert warning.msg == "Using closest pi"
+
+
+def test_partial_warning_does_not_break_its_result(raw_full_results):
+  raw_full_results["warnings"] = [
+    {"text": "Interpreting", "word": "pii"},
+    {"text": "Interpreting", "word": "pii", "suggestion": "pi"}
+  ]
+  result = FullResults.from_dict(raw_full_results)
+  assert [type(warning) for warning in result.warnings] == [Warning, SpellCheckWarning]
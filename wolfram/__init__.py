@@ -1,6 +1,14 @@
-from wolfram.client import Client, AsyncClient
+from wolfram.client import Client, AsyncClient, PreparedQuery
+from wolfram.appid import AppIDPool
+from wolfram.breaker import CircuitBreaker, CircuitState
+from wolfram.budget import PhaseTimings
+from wolfram.cache import Cache, MemoryCache, SQLiteCache, TieredCache
+from wolfram.hedge import HedgePolicy
 from wolfram.params import Bool, LatLong, Units
-from wolfram import api
+from wolfram.ratelimit import RateLimiter, TokenBucketLimiter
+from wolfram.retry import RetryPolicy
+from wolfram.router import EscalationPolicy, Router
+from wolfram import api, decoder
 
 __title__ = "wolfram.py"
 __author__ = "Jus-Codin"
@@ -10,8 +18,24 @@ __version__ = "1.0.0"
 __all__ = (
   Client,
   AsyncClient,
+  PreparedQuery,
+  AppIDPool,
   api,
+  decoder,
   Bool,
   LatLong,
-  Units
+  Units,
+  RateLimiter,
+  TokenBucketLimiter,
+  RetryPolicy,
+  Cache,
+  MemoryCache,
+  SQLiteCache,
+  TieredCache,
+  HedgePolicy,
+  CircuitBreaker,
+  CircuitState,
+  Router,
+  EscalationPolicy,
+  PhaseTimings
 )
\ No newline at end of file
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from wolfram import decoder
+from wolfram.decoder import JSONLoads
 from wolfram.exceptions import InterpretationError, MissingParameters, InvalidAppID, WolframException
-from wolfram.models import ConversationalResults, FullResults, Model, SimpleImage
+from wolfram.factory import always_list
+from wolfram.models import ConversationalResults, FullResults, Model, Pod, SimpleImage
 
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
@@ -12,12 +15,16 @@ if TYPE_CHECKING:
 class API:
   VERSION: int
   ENDPOINT: str
+  INPUT: str = "i"
   PARAMS: Dict[str, str] = {}
+  # The parameters bounding how long the API works on a query, with their default values in seconds
+  TIMEOUT_PARAMS: Dict[str, float] = {}
 
-  def format_results(resp: Response):
+  # `loads` is the function JSON responses are decoded with, given by the client
+  def format_results(resp: Response, loads: JSONLoads = decoder.loads):
     raise NotImplementedError
 
-  async def async_format_results(resp: ClientResponse):
+  async def async_format_results(resp: ClientResponse, loads: JSONLoads = decoder.loads):
     raise NotImplementedError
 
 
@@ -25,25 +32,47 @@ class API:
 class FullResultsAPI(API):
   VERSION = 2
   ENDPOINT = "query"
+  INPUT = "input"
   PARAMS = {
     "output": "json"
   }
+  TIMEOUT_PARAMS = {
+    "scantimeout": 3.0,
+    "podtimeout": 4.0,
+    "formattimeout": 8.0,
+    "parsetimeout": 5.0,
+    "totaltimeout": 20.0
+  }
 
-  def format_results(resp: Response) -> FullResults:
-    raw = resp.json()
+  def format_results(resp: Response, loads: JSONLoads = decoder.loads) -> FullResults:
+    raw = loads(resp.content)
     return FullResults.from_dict(raw["queryresult"])
 
-  async def async_format_results(resp: ClientResponse) -> FullResults:
-    raw = await resp.json()
+  async def async_format_results(resp: ClientResponse, loads: JSONLoads = decoder.loads) -> FullResults:
+    raw = loads(await resp.read())
     return FullResults.from_dict(raw["queryresult"])
 
+  def format_pod(resp: Response, loads: JSONLoads = decoder.loads) -> Pod:
+    """Formats the response to the url of a deferred pod"""
+    resp.raise_for_status()
+    return Pod.from_dict(_unwrap_pod(loads(resp.content)))
+
+  async def async_format_pod(resp: ClientResponse, loads: JSONLoads = decoder.loads) -> Pod:
+    """Formats the response to the url of a deferred pod"""
+    resp.raise_for_status()
+    # Deferred pods are not always served as JSON, so the content type is not checked
+    return Pod.from_dict(_unwrap_pod(loads(await resp.read())))
+
 
 
 class SimpleAPI(API):
   VERSION = 1
   ENDPOINT = "simple"
+  TIMEOUT_PARAMS = {
+    "timeout": 5.0
+  }
 
-  def format_results(resp: Response) -> SimpleImage:
+  def format_results(resp: Response, loads: JSONLoads = decoder.loads) -> SimpleImage:
     if resp.status_code == 501:
       raise InterpretationError("input was unable to be interpreted by the API")
     elif resp.status_code == 400:
@@ -57,7 +86,7 @@ class SimpleAPI(API):
 
     return SimpleImage(resp.content)
 
-  async def async_format_results(resp: ClientResponse) -> SimpleImage:
+  async def async_format_results(resp: ClientResponse, loads: JSONLoads = decoder.loads) -> SimpleImage:
     if resp.status == 501:
       raise InterpretationError("input was unable to be interpreted by the API")
     elif resp.status == 400:
@@ -76,8 +105,11 @@ class SimpleAPI(API):
 class ShortAPI(API):
   VERSION = 1
   ENDPOINT = "result"
+  TIMEOUT_PARAMS = {
+    "timeout": 5.0
+  }
 
-  def format_results(resp: Response) -> str:
+  def format_results(resp: Response, loads: JSONLoads = decoder.loads) -> str:
     if resp.status_code == 501:
       raise InterpretationError("input was unable to be interpreted by the API")
     elif resp.status_code == 400:
@@ -91,7 +123,7 @@ class ShortAPI(API):
 
     return resp.text
 
-  async def async_format_results(resp: ClientResponse) -> str:
+  async def async_format_results(resp: ClientResponse, loads: JSONLoads = decoder.loads) -> str:
     if resp.status == 501:
       raise InterpretationError("input was unable to be interpreted by the API")
     elif resp.status == 400:
@@ -110,8 +142,11 @@ class ShortAPI(API):
 class SpokenAPI(API):
   VERSION = 1
   ENDPOINT = "spoken"
+  TIMEOUT_PARAMS = {
+    "timeout": 5.0
+  }
 
-  def format_results(resp: Response) -> str:
+  def format_results(resp: Response, loads: JSONLoads = decoder.loads) -> str:
     if resp.status_code == 501:
       raise InterpretationError("input was unable to be interpreted by the API")
     elif resp.status_code == 400:
@@ -125,17 +160,18 @@ class SpokenAPI(API):
 
     return resp.text
 
-  async def async_format_results(resp: ClientResponse) -> str:
+  async def async_format_results(resp: ClientResponse, loads: JSONLoads = decoder.loads) -> str:
     if resp.status == 501:
       raise InterpretationError("input was unable to be interpreted by the API")
     elif resp.status == 400:
       raise MissingParameters("input parameter was not found")
     elif resp.status == 403:
       # In this case it is likely an invalid app id
-      if await resp.text == "Error 1: Invalid appid":
+      text = await resp.text()
+      if text == "Error 1: Invalid appid":
         raise InvalidAppID("App ID was invalid")
       else:
-        raise WolframException(await resp.text) # This should not happen
+        raise WolframException(text) # This should not happen
 
     return await resp.text()
 
@@ -145,7 +181,7 @@ class ConversationalAPI(API):
   VERSION = 1
   ENDPOINT = "conversation.jsp"
 
-  def format_results(resp: Response) -> ConversationalResults:
+  def format_results(resp: Response, loads: JSONLoads = decoder.loads) -> ConversationalResults:
     if resp.status_code == 403:
       # In this case it is likely an invalid app id
       if resp.text == "Error 1: Invalid appid":
@@ -153,7 +189,7 @@ class ConversationalAPI(API):
       else:
         raise WolframException(resp.text) # This should not happen
 
-    raw = resp.json()
+    raw = loads(resp.content)
 
     if raw.get("conversationID") is None: # This is a little bit of hard coding, might be reworked
       error = raw.get("error")
@@ -166,13 +202,33 @@ class ConversationalAPI(API):
     else:
       return ConversationalResults.from_dict(raw)
 
-  async def async_format_results(resp: ClientResponse) -> ConversationalResults:
+  async def async_format_results(resp: ClientResponse, loads: JSONLoads = decoder.loads) -> ConversationalResults:
     if resp.status == 403:
       # In this case it is likely an invalid app id
-      if await resp.text == "Error 1: Invalid appid":
+      text = await resp.text()
+      if text == "Error 1: Invalid appid":
         raise InvalidAppID("App ID was invalid")
       else:
-        raise WolframException(await resp.text) # This should not happen
+        raise WolframException(text) # This should not happen
+
+    raw = loads(await resp.read())
+
+    if raw.get("conversationID") is None: # This is a little bit of hard coding, might be reworked
+      error = raw.get("error")
+      if error == "No result is available":
+        raise InterpretationError("input was unable to be interpreted by the API")
+      elif error == "No input.":
+        raise MissingParameters("input parameter was not found")
+      else:
+        raise WolframException(error) # Worse case scenario
+    else:
+      return ConversationalResults.from_dict(raw)
+
 
-    raw = await resp.json()
-    return ConversationalResults.from_dict(raw)
\ No newline at end of file
+def _unwrap_pod(raw: Dict[str, Any]) -> Dict[str, Any]:
+  """Returns the pod in the response to the url of a deferred pod,
+  which is either the pod itself or a query result holding it"""
+  raw = raw.get("queryresult", raw)
+  if "pods" in raw:
+    raw = always_list(raw["pods"])[0]
+  return raw
@@ -0,0 +1,151 @@
+"""
+Pools of App IDs used to spread queries across several keys
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from wolfram.exceptions import InvalidAppID, QuotaExceeded
+
+
+class _Key:
+  __slots__ = ("appid", "quota", "weight", "used", "invalid", "current")
+
+  def __init__(self, appid: str, quota: Optional[int], weight: int):
+    self.appid = appid
+    self.quota = quota
+    self.weight = weight
+    self.used = 0
+    self.invalid = False
+    self.current = 0
+
+  @property
+  def available(self) -> bool:
+    return not self.invalid and (self.quota is None or self.used < self.quota)
+
+
+
+class AppIDPool:
+  """A pool of App IDs that queries are spread across
+
+  Every request made by a client takes a key from the pool. A key is taken out
+  of rotation once it has used up its quota, or once the API reports it as invalid.
+  The pool is safe to share between threads and clients.
+
+  Parameters
+  ----------
+  appids: Iterable[`str`]
+    The App IDs in the pool.
+  quotas: Optional[Mapping[`str`, `int`]]
+    The number of requests each App ID is allowed to make. App IDs
+    without a quota are never taken out of rotation for their usage.
+  weights: Optional[Mapping[`str`, `int`]]
+    The share of requests each App ID should receive, relative to the
+    others. App IDs without a weight have a weight of `1`.
+  strategy: `str`
+    How App IDs are picked, either `"least_used"` to pick the key with the
+    fewest requests relative to its weight, or `"round_robin"` for weighted
+    round-robin. Defaults to `"least_used"`.
+  """
+
+  STRATEGIES = ("least_used", "round_robin")
+
+  def __init__(
+    self,
+    appids: Iterable[str],
+    *,
+    quotas: Optional[Mapping[str, int]] = None,
+    weights: Optional[Mapping[str, int]] = None,
+    strategy: str = "least_used"
+  ):
+    if strategy not in self.STRATEGIES:
+      raise ValueError(f"Unknown strategy '{strategy}'.")
+    quotas = quotas or {}
+    weights = weights or {}
+    self._keys: Dict[str, _Key] = {
+      appid: _Key(appid, quotas.get(appid), weights.get(appid, 1))
+      for appid in appids
+    }
+    if not self._keys:
+      raise ValueError("at least one App ID is required")
+    if any(key.weight < 1 for key in self._keys.values()):
+      raise ValueError("weights must be at least 1")
+    self._strategy = strategy
+    self._lock = threading.Lock()
+
+  def __repr__(self):
+    return f"AppIDPool(appids={self.appids}, strategy={self._strategy})"
+
+  def __len__(self):
+    return len(self._keys)
+
+  @property
+  def appids(self) -> List[str]:
+    """Every App ID in the pool, including those out of rotation"""
+    return list(self._keys)
+
+  @property
+  def available(self) -> List[str]:
+    """The App IDs currently in rotation"""
+    with self._lock:
+      return [key.appid for key in self._keys.values() if key.available]
+
+  @property
+  def usage(self) -> Dict[str, int]:
+    """The number of requests made with each App ID"""
+    with self._lock:
+      return {key.appid: key.used for key in self._keys.values()}
+
+  def acquire(self) -> str:
+    """Picks an App ID for a request, counting the request against its quota
+
+    Raises
+    ------
+    ~wolfram.exceptions.InvalidAppID
+      Every App ID in the pool is invalid.
+    ~wolfram.exceptions.QuotaExceeded
+      Every valid App ID in the pool has used up its quota.
+    """
+    with self._lock:
+      keys = [key for key in self._keys.values() if key.available]
+      if not keys:
+        if all(key.invalid for key in self._keys.values()):
+          raise InvalidAppID("App ID was invalid")
+        raise QuotaExceeded("every App ID in the pool has used up its quota")
+
+      if self._strategy == "least_used":
+        key = min(keys, key=lambda k: k.used / k.weight)
+      else:
+        # Smooth weighted round-robin, which interleaves keys instead of
+        # sending bursts of requests to the heaviest one
+        total = 0
+        for k in keys:
+          k.current += k.weight
+          total += k.weight
+        key = max(keys, key=lambda k: k.current)
+        key.current -= total
+
+      key.used += 1
+      return key.appid
+
+  def use(self, appid: str):
+    """Counts an extra request made with an App ID that was already acquired,
+    such as a hedged request"""
+    with self._lock:
+      self._keys[appid].used += 1
+
+  def invalidate(self, appid: str) -> bool:
+    """Takes an App ID reported as invalid out of rotation,
+    returning whether any App ID is still in rotation"""
+    with self._lock:
+      self._keys[appid].invalid = True
+      return any(key.available for key in self._keys.values())
+
+  def reset(self, appid: Optional[str] = None):
+    """Resets the usage of an App ID, or of every App ID if none is given,
+    such as at the start of a new quota period. Invalid App IDs stay out of rotation"""
+    with self._lock:
+      keys = self._keys.values() if appid is None else [self._keys[appid]]
+      for key in keys:
+        key.used = 0
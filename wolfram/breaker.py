@@ -0,0 +1,204 @@
+"""
+Circuit breakers used to fail fast while the API is degraded
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from wolfram.exceptions import CircuitOpen
+
+
+class CircuitState(Enum):
+  CLOSED = "closed"
+  OPEN = "open"
+  HALF_OPEN = "half_open"
+
+  def __str__(self):
+    return str(self.value)
+
+
+Listener = Callable[[str, CircuitState, CircuitState], None]
+
+
+class _Circuit:
+  __slots__ = ("state", "outcomes", "opened", "probes", "successes", "generation")
+
+  def __init__(self, window: int):
+    self.state = CircuitState.CLOSED
+    # Each outcome is a pair of (failed, slow)
+    self.outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+    self.opened = 0.0
+    self.probes = 0
+    self.successes = 0
+    # Incremented on every change of state, so that requests started
+    # before the change do not count towards the new state
+    self.generation = 0
+
+
+
+class CircuitBreaker:
+  """A circuit breaker with a separate circuit per API endpoint, that is per base url and API
+
+  A circuit starts closed, letting requests through. Once too many of the recent requests
+  to an endpoint failed or were slow, the circuit opens and queries to that endpoint
+  immediately raise :class:`~wolfram.exceptions.CircuitOpen` instead of waiting on the API.
+  After a while the circuit becomes half-open and lets a few probe requests through,
+  closing again if they succeed or opening again if any of them fails.
+
+  Connection errors, timeouts and server errors count as failures. Errors reported
+  by the API, such as :class:`~wolfram.exceptions.InterpretationError`, do not,
+  and neither do requests that timed out because the deadline of their query passed.
+
+  Parameters
+  ----------
+  failure_rate: `float`
+    The fraction of failed requests that opens the circuit. Defaults to `0.5`.
+  slow_call_duration: Optional[`float`]
+    How long a request can take before it is considered slow, in seconds.
+    If not given, slow requests never open the circuit.
+  slow_call_rate: `float`
+    The fraction of slow requests that opens the circuit. Defaults to `0.5`.
+  window: `int`
+    The number of recent requests the rates are computed from. Defaults to `20`.
+  min_calls: `int`
+    The number of requests to observe before the circuit can open. Defaults to `10`.
+  open_duration: `float`
+    How long the circuit stays open before probing, in seconds. Defaults to `30`.
+  probes: `int`
+    The number of successful probe requests needed to close the circuit. Defaults to `1`.
+  """
+
+  def __init__(
+    self,
+    *,
+    failure_rate: float = 0.5,
+    slow_call_duration: Optional[float] = None,
+    slow_call_rate: float = 0.5,
+    window: int = 20,
+    min_calls: int = 10,
+    open_duration: float = 30,
+    probes: int = 1
+  ):
+    self._failure_rate = failure_rate
+    self._slow_call_duration = slow_call_duration
+    self._slow_call_rate = slow_call_rate
+    self._window = window
+    self._min_calls = min(min_calls, window)
+    self._open_duration = open_duration
+    self._probes = probes
+    self._circuits: Dict[str, _Circuit] = {}
+    self._listeners: List[Listener] = []
+    self._lock = threading.Lock()
+
+  def __repr__(self):
+    return f"CircuitBreaker(failure_rate={self._failure_rate}, open_duration={self._open_duration})"
+
+  def add_listener(self, listener: Listener):
+    """Registers a function called with the endpoint, the old state
+    and the new state whenever a circuit changes state"""
+    self._listeners.append(listener)
+
+  def remove_listener(self, listener: Listener):
+    """Unregisters a function registered with :meth:`add_listener`"""
+    self._listeners.remove(listener)
+
+  def state(self, endpoint: str) -> CircuitState:
+    """Returns the state of the circuit of an endpoint"""
+    with self._lock:
+      circuit = self._circuits.get(endpoint)
+      return circuit.state if circuit is not None else CircuitState.CLOSED
+
+  @property
+  def states(self) -> Dict[str, CircuitState]:
+    """The state of the circuit of every endpoint seen so far"""
+    with self._lock:
+      return {endpoint: circuit.state for endpoint, circuit in self._circuits.items()}
+
+  def before(self, endpoint: str) -> int:
+    """Called before a request is sent to `endpoint`, returning a token
+    to pass to :meth:`record` or :meth:`release` once it finishes
+
+    Raises
+    ------
+    ~wolfram.exceptions.CircuitOpen
+      The circuit of the endpoint is open, or half-open with every probe already in flight.
+    """
+    transition = None
+    with self._lock:
+      circuit = self._circuits.get(endpoint)
+      if circuit is None:
+        circuit = self._circuits[endpoint] = _Circuit(self._window)
+
+      if circuit.state is CircuitState.OPEN:
+        if time.monotonic() - circuit.opened < self._open_duration:
+          raise CircuitOpen(f"circuit for {endpoint} is open")
+        transition = self._transition(endpoint, circuit, CircuitState.HALF_OPEN)
+
+      if circuit.state is CircuitState.HALF_OPEN:
+        if circuit.probes >= self._probes - circuit.successes:
+          raise CircuitOpen(f"circuit for {endpoint} is half-open and already probing")
+        circuit.probes += 1
+      token = circuit.generation
+    self._emit(transition)
+    return token
+
+  def record(self, endpoint: str, success: bool, duration: float, token: Optional[int] = None):
+    """Records the outcome of a request sent to `endpoint`, which took `duration` seconds.
+    The outcome is ignored if the circuit changed state since :meth:`before` returned `token`"""
+    slow = self._slow_call_duration is not None and duration > self._slow_call_duration
+    transition = None
+    with self._lock:
+      circuit = self._circuits[endpoint]
+      if token is not None and token != circuit.generation:
+        return
+      if circuit.state is CircuitState.HALF_OPEN:
+        circuit.probes -= 1
+        if not success or slow:
+          transition = self._transition(endpoint, circuit, CircuitState.OPEN)
+        else:
+          circuit.successes += 1
+          if circuit.successes >= self._probes:
+            transition = self._transition(endpoint, circuit, CircuitState.CLOSED)
+      elif circuit.state is CircuitState.CLOSED:
+        circuit.outcomes.append((not success, slow))
+        if len(circuit.outcomes) >= self._min_calls and self._tripped(circuit):
+          transition = self._transition(endpoint, circuit, CircuitState.OPEN)
+    self._emit(transition)
+
+  def release(self, endpoint: str, token: Optional[int] = None):
+    """Called instead of :meth:`record` when a request was cancelled before it finished,
+    or failed in a way that says nothing about the health of the endpoint"""
+    with self._lock:
+      circuit = self._circuits[endpoint]
+      if token is not None and token != circuit.generation:
+        return
+      if circuit.state is CircuitState.HALF_OPEN:
+        circuit.probes -= 1
+
+  def _tripped(self, circuit: _Circuit) -> bool:
+    total = len(circuit.outcomes)
+    failures = sum(failed for failed, _ in circuit.outcomes)
+    slow = sum(slow for _, slow in circuit.outcomes)
+    return (
+      failures / total >= self._failure_rate
+      or (self._slow_call_duration is not None and slow / total >= self._slow_call_rate)
+    )
+
+  def _transition(self, endpoint: str, circuit: _Circuit, state: CircuitState):
+    old, circuit.state = circuit.state, state
+    circuit.generation += 1
+    circuit.outcomes.clear()
+    circuit.probes = circuit.successes = 0
+    if state is CircuitState.OPEN:
+      circuit.opened = time.monotonic()
+    return endpoint, old, state
+
+  def _emit(self, transition: Optional[Tuple[str, CircuitState, CircuitState]]):
+    # Listeners are called outside of the lock, so that they can inspect the breaker
+    if transition is not None:
+      for listener in list(self._listeners):
+        listener(*transition)
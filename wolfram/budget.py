@@ -0,0 +1,82 @@
+"""
+Latency budgets split among the timeouts of the FullResults API
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Tuple
+
+if TYPE_CHECKING:
+  from wolfram.models import FullResults
+
+
+class PhaseTimings:
+  """Timings of the phases of the FullResults API, learned from past results,
+  used to split a latency budget among the timeouts of the API
+
+  A query is parsed, then scanned, then its pods are formatted. The API reports how long
+  a query took in total and how long it spent parsing the input, which gives the share of
+  the budget spent parsing. The rest is split between scanning and formatting, and a single
+  pod can take up half of the formatting time, in the same proportions as the API's own defaults.
+
+  Parameters
+  ----------
+  window: `int`
+    The number of recent results the timings are computed from. Defaults to `100`.
+  min_timeout: `float`
+    The lowest timeout sent for any phase, in seconds. Defaults to `0.1`.
+  """
+
+  # Shares derived from the API's default timeouts, the parse share
+  # only being used until timings have been observed
+  DEFAULT_PARSE_SHARE = 5.0 / 20.0
+  SCAN_SHARE = 3.0 / 11.0
+  POD_SHARE = 4.0 / 8.0
+
+  def __init__(self, *, window: int = 100, min_timeout: float = 0.1):
+    self._min_timeout = min_timeout
+    # Each sample is a pair of (total timing, parse timing)
+    self._samples: Deque[Tuple[float, float]] = deque(maxlen=window)
+    self._lock = threading.Lock()
+
+  def __repr__(self):
+    return f"PhaseTimings(samples={len(self._samples)}, parse_share={self.parse_share:.2f})"
+
+  @property
+  def parse_share(self) -> float:
+    """The fraction of the time of a query spent parsing its input"""
+    with self._lock:
+      total = sum(timing for timing, _ in self._samples)
+      parse = sum(parsetiming for _, parsetiming in self._samples)
+    if total <= 0:
+      return self.DEFAULT_PARSE_SHARE
+    # Parsing never gets the whole budget, nor so little that it cannot finish
+    return min(0.5, max(0.05, parse / total))
+
+  def record(self, result: FullResults):
+    """Records the timings reported by a result"""
+    try:
+      timing = float(result.get("timing", 0))
+      parsetiming = float(result.get("parsetiming", 0))
+    except (TypeError, ValueError):
+      return
+    if timing > 0:
+      with self._lock:
+        self._samples.append((timing, min(parsetiming, timing)))
+
+  def split(self, budget: float) -> Dict[str, float]:
+    """Splits a latency budget, in seconds, into the timeout parameters of the API"""
+    if budget <= 0:
+      raise ValueError("latency budget must be positive")
+    parse = budget * self.parse_share
+    scan = (budget - parse) * self.SCAN_SHARE
+    format = budget - parse - scan
+    timeouts = {
+      "parsetimeout": parse,
+      "scantimeout": scan,
+      "formattimeout": format,
+      "podtimeout": format * self.POD_SHARE,
+      "totaltimeout": budget
+    }
+    return {name: round(max(self._min_timeout, timeout), 2) for name, timeout in timeouts.items()}
@@ -0,0 +1,671 @@
+"""
+Response caches used to avoid repeating identical queries
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from wolfram import exceptions
+from wolfram.exceptions import WolframException
+from wolfram.models import ConversationalResults, FullResults, SimpleImage
+
+
+@dataclass
+class CacheStats:
+  """Counters collected by a cache"""
+  hits: int = 0
+  stale_hits: int = 0
+  negative_hits: int = 0
+  misses: int = 0
+  evictions: int = 0
+  expirations: int = 0
+  entries: int = 0
+  size: int = 0
+
+  @property
+  def hit_rate(self) -> float:
+    """The fraction of lookups that were hits, including stale and negative hits"""
+    hits = self.hits + self.stale_hits + self.negative_hits
+    lookups = hits + self.misses
+    return hits / lookups if lookups else 0.0
+
+
+
+class NegativeResult:
+  """A cached query that did not produce a useful result, either because the input
+  could not be interpreted or because the API returned a fallthrough result.
+
+  Negative results are cached for a shorter time than regular results, and are
+  replayed by the client without sending the query again.
+  """
+  __slots__ = ("exception", "result")
+
+  def __init__(self, exception: Optional[WolframException] = None, result: Any = None):
+    # A copy is kept rather than the exception itself, whose traceback
+    # would keep the frames it was raised through alive while it is cached
+    if exception is not None:
+      exception = type(exception)(*exception.args)
+    self.exception = exception
+    self.result = result
+
+  def __repr__(self):
+    if self.exception is not None:
+      return f"NegativeResult(exception={self.exception!r})"
+    return f"NegativeResult(result={self.result!r})"
+
+  def replay(self) -> Any:
+    """Raises a copy of the cached exception, or returns the cached fallthrough result"""
+    if self.exception is not None:
+      raise type(self.exception)(*self.exception.args)
+    return self.result
+
+
+
+class Cache:
+  """The base class of response caches.
+
+  Clients look up the canonical url of every query with :meth:`lookup`
+  before sending it, and store the result with :meth:`set` afterwards.
+  Queries that did not produce a useful result are stored as a :class:`NegativeResult`.
+  """
+
+  def get(self, key: str) -> Optional[Any]:
+    """Returns the result cached for `key`, or `None` if there is none"""
+    return self.lookup(key)[0]
+
+  def lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+    """Returns the result cached for `key`, or `None` if there is none,
+    along with whether the result is stale and should be refreshed"""
+    raise NotImplementedError
+
+  def set(self, key: str, value: Any, ttl: Optional[float] = None):
+    """Caches `value` for `key`, for `ttl` seconds if given.
+    Otherwise, the default time of the cache for regular or negative results is used"""
+    raise NotImplementedError
+
+  def delete(self, key: str):
+    """Removes the result cached for `key`, if any"""
+    raise NotImplementedError
+
+  def clear(self):
+    """Removes every cached result"""
+    raise NotImplementedError
+
+  @property
+  def stats(self) -> CacheStats:
+    """A snapshot of the counters of the cache"""
+    raise NotImplementedError
+
+
+
+class _Entry:
+  __slots__ = ("value", "size", "fresh", "expires")
+
+  def __init__(self, value: Any, size: int, fresh: float, expires: float):
+    self.value = value
+    self.size = size
+    self.fresh = fresh
+    self.expires = expires
+
+
+
+class MemoryCache(Cache):
+  """An in-process cache evicting results once they expire or when it runs out of space
+
+  The size of the cache is measured in bytes rather than in entries, since a
+  :class:`~wolfram.models.SimpleImage` is many times larger than a short answer.
+  Once the cache is full, expired results are dropped first, then the least recently used ones.
+  The cache is safe to share between threads and clients.
+
+  Parameters
+  ----------
+  max_size: `int`
+    The approximate maximum size of all cached results, in bytes. Defaults to 64 MiB.
+  ttl: `float`
+    How long results are cached for by default, in seconds. Defaults to `300`.
+  stale_ttl: `float`
+    How long results are kept after they stop being fresh, in seconds.
+    During that time a stale result is still served, while the client
+    refreshes it in the background. Defaults to `0`.
+  negative_ttl: `float`
+    How long negative results are cached for by default, in seconds.
+    `0` disables negative caching. Defaults to `60`.
+  """
+
+  def __init__(
+    self,
+    max_size: int = 64 * 1024 * 1024,
+    ttl: float = 300,
+    stale_ttl: float = 0,
+    negative_ttl: float = 60
+  ):
+    self._max_size = max_size
+    self._ttl = ttl
+    self._stale_ttl = stale_ttl
+    self._negative_ttl = negative_ttl
+    self._entries: OrderedDict[str, _Entry] = OrderedDict()
+    self._size = 0
+    self._stats = CacheStats()
+    self._lock = threading.Lock()
+
+  def __repr__(self):
+    return f"MemoryCache(max_size={self._max_size}, ttl={self._ttl})"
+
+  def __len__(self):
+    return len(self._entries)
+
+  def __contains__(self, key: str):
+    with self._lock:
+      entry = self._entries.get(key)
+      return entry is not None and entry.expires > time.monotonic()
+
+  @property
+  def max_size(self) -> int:
+    return self._max_size
+
+  @property
+  def ttl(self) -> float:
+    return self._ttl
+
+  @property
+  def stale_ttl(self) -> float:
+    return self._stale_ttl
+
+  @property
+  def negative_ttl(self) -> float:
+    return self._negative_ttl
+
+  @property
+  def stats(self) -> CacheStats:
+    with self._lock:
+      return CacheStats(
+        **{**vars(self._stats), "entries": len(self._entries), "size": self._size}
+      )
+
+  def lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+    now = time.monotonic()
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        self._stats.misses += 1
+        return None, False
+      if entry.expires <= now:
+        self._remove(key)
+        self._stats.expirations += 1
+        self._stats.misses += 1
+        return None, False
+      self._entries.move_to_end(key)
+      stale = entry.fresh <= now
+      if isinstance(entry.value, NegativeResult):
+        self._stats.negative_hits += 1
+      elif stale:
+        self._stats.stale_hits += 1
+      else:
+        self._stats.hits += 1
+      return entry.value, stale
+
+  def set(self, key: str, value: Any, ttl: Optional[float] = None):
+    ttl = _default_ttl(value, ttl, self._ttl, self._negative_ttl)
+    size = sizeof(value)
+    if ttl <= 0 or size > self._max_size:
+      return
+    fresh = time.monotonic() + ttl
+    expires = fresh if isinstance(value, NegativeResult) else fresh + self._stale_ttl
+    with self._lock:
+      if key in self._entries:
+        self._remove(key)
+      self._entries[key] = _Entry(value, size, fresh, expires)
+      self._size += size
+      if self._size > self._max_size:
+        self._evict()
+
+  def delete(self, key: str):
+    with self._lock:
+      if key in self._entries:
+        self._remove(key)
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+      self._size = 0
+
+  def _remove(self, key: str) -> _Entry:
+    entry = self._entries.pop(key)
+    self._size -= entry.size
+    return entry
+
+  def _evict(self):
+    """Frees up space until the cache fits in its maximum size"""
+    now = time.monotonic()
+    for key in [k for k, entry in self._entries.items() if entry.expires <= now]:
+      self._remove(key)
+      self._stats.expirations += 1
+
+    while self._size > self._max_size:
+      _, entry = self._entries.popitem(last=False)
+      self._size -= entry.size
+      self._stats.evictions += 1
+
+
+
+class SQLiteCache(Cache):
+  """A persistent cache stored in a local SQLite database, which survives restarts
+
+  Results are stored compactly: the raw JSON of :class:`~wolfram.models.FullResults` and
+  :class:`~wolfram.models.ConversationalResults`, the image data of a
+  :class:`~wolfram.models.SimpleImage` and the text of short and spoken answers.
+  The database uses write-ahead logging, so it can be read from several threads
+  and processes at once while it is being written to.
+
+  Expired results are removed in the background, and whenever the cache grows past
+  its maximum size the least recently used results are evicted until it is back under
+  90% of it, so that a full cache does not have to evict on every insert.
+
+  Parameters
+  ----------
+  path: `str`
+    The path of the database file.
+  max_size: `int`
+    The approximate maximum size of all cached results, in bytes. Defaults to 256 MiB.
+  ttl: `float`
+    How long results are cached for by default, in seconds. Defaults to `86400`.
+  stale_ttl: `float`
+    How long results are kept after they stop being fresh, in seconds.
+    During that time a stale result is still served, while the client
+    refreshes it in the background. Defaults to `0`.
+  negative_ttl: `float`
+    How long negative results are cached for by default, in seconds.
+    `0` disables negative caching. Defaults to `3600`.
+  sweep_interval: Optional[`float`]
+    How often expired results are removed in the background, in seconds.
+    `None` disables the background sweep, in which case :meth:`sweep`
+    should be called manually. Defaults to `60`.
+  """
+
+  def __init__(
+    self,
+    path: str,
+    *,
+    max_size: int = 256 * 1024 * 1024,
+    ttl: float = 86400,
+    stale_ttl: float = 0,
+    negative_ttl: float = 3600,
+    sweep_interval: Optional[float] = 60
+  ):
+    self._path = path
+    self._max_size = max_size
+    self._ttl = ttl
+    self._stale_ttl = stale_ttl
+    self._negative_ttl = negative_ttl
+    self._local = threading.local()
+    self._connections: List[sqlite3.Connection] = []
+    self._lock = threading.Lock()
+    self._stats = CacheStats()
+    # Access times are kept in memory and written on the next sweep,
+    # so that lookups never have to write to the database
+    self._accessed: Dict[str, float] = {}
+
+    conn = self._connection()
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(
+      """
+      CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        data BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        expires REAL NOT NULL,
+        accessed REAL NOT NULL,
+        fresh REAL
+      );
+      CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires);
+      CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+      """
+    )
+    self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    self._closed = threading.Event()
+    self._sweeper = None
+    if sweep_interval is not None:
+      self._sweeper = threading.Thread(
+        target=self._sweep_periodically,
+        args=(sweep_interval,),
+        name="wolfram-cache-sweeper",
+        daemon=True
+      )
+      self._sweeper.start()
+
+  def __repr__(self):
+    return f"SQLiteCache(path={self._path!r}, max_size={self._max_size}, ttl={self._ttl})"
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self.close()
+
+  @property
+  def path(self) -> str:
+    return self._path
+
+  @property
+  def max_size(self) -> int:
+    return self._max_size
+
+  @property
+  def ttl(self) -> float:
+    return self._ttl
+
+  @property
+  def stale_ttl(self) -> float:
+    return self._stale_ttl
+
+  @property
+  def negative_ttl(self) -> float:
+    return self._negative_ttl
+
+  @property
+  def stats(self) -> CacheStats:
+    entries, size = self._connection().execute(
+      "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+    ).fetchone()
+    with self._lock:
+      return CacheStats(**{**vars(self._stats), "entries": entries, "size": size})
+
+  def _connection(self) -> sqlite3.Connection:
+    """Returns the connection of the current thread, opening one if needed"""
+    conn = getattr(self._local, "conn", None)
+    if conn is None:
+      conn = sqlite3.connect(self._path, timeout=30, check_same_thread=False)
+      conn.execute("PRAGMA synchronous=NORMAL")
+      self._local.conn = conn
+      with self._lock:
+        self._connections.append(conn)
+    return conn
+
+  def lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+    row = self._connection().execute(
+      "SELECT kind, data, expires, COALESCE(fresh, expires) FROM responses WHERE key = ?",
+      (key,)
+    ).fetchone()
+    now = time.time()
+    with self._lock:
+      if row is None or row[2] <= now:
+        self._stats.misses += 1
+        return None, False
+      stale = row[3] <= now
+      if row[0] in _NEGATIVE_KINDS:
+        self._stats.negative_hits += 1
+      elif stale:
+        self._stats.stale_hits += 1
+      else:
+        self._stats.hits += 1
+      self._accessed[key] = now
+    return _loads(row[0], row[1]), stale
+
+  def set(self, key: str, value: Any, ttl: Optional[float] = None):
+    ttl = _default_ttl(value, ttl, self._ttl, self._negative_ttl)
+    dumped = _dumps(value)
+    if ttl <= 0 or dumped is None:
+      return
+    kind, data = dumped
+    now = time.time()
+    fresh = now + ttl
+    expires = fresh if kind in _NEGATIVE_KINDS else fresh + self._stale_ttl
+    conn = self._connection()
+    with conn:
+      # The size of a replaced result is read in the same transaction, so that it is not counted twice
+      conn.execute("BEGIN IMMEDIATE")
+      replaced = self._row_size(conn, key)
+      conn.execute(
+        "INSERT OR REPLACE INTO responses (key, kind, data, size, expires, accessed, fresh)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (key, kind, data, len(data), expires, now, fresh)
+      )
+    with self._lock:
+      self._size += len(data) - replaced
+      full = self._size > self._max_size
+    if full:
+      self.sweep()
+
+  def delete(self, key: str):
+    conn = self._connection()
+    with conn:
+      conn.execute("BEGIN IMMEDIATE")
+      deleted = self._row_size(conn, key)
+      conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+    with self._lock:
+      self._size -= deleted
+      self._accessed.pop(key, None)
+
+  @staticmethod
+  def _row_size(conn: sqlite3.Connection, key: str) -> int:
+    row = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+    return 0 if row is None else row[0]
+
+  def clear(self):
+    conn = self._connection()
+    with conn:
+      conn.execute("DELETE FROM responses")
+    with self._lock:
+      self._accessed.clear()
+      self._size = 0
+
+  def sweep(self):
+    """Removes expired results, then if the cache is larger than its maximum size,
+    evicts the least recently used results until it is back under 90% of it"""
+    with self._lock:
+      accessed, self._accessed = self._accessed, {}
+
+    conn = self._connection()
+    with conn:
+      conn.executemany(
+        "UPDATE responses SET accessed = ? WHERE key = ?",
+        [(t, k) for k, t in accessed.items()]
+      )
+      expired = conn.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),)).rowcount
+      size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+      evicted = 0
+      if size > self._max_size:
+        low_water = self._max_size * _LOW_WATER
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+        keys = []
+        for key, entry_size in rows:
+          if size <= low_water:
+            break
+          keys.append((key,))
+          size -= entry_size
+        conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+        evicted = len(keys)
+
+    with self._lock:
+      self._size = size
+      self._stats.expirations += expired
+      self._stats.evictions += evicted
+
+  def _sweep_periodically(self, interval: float):
+    while not self._closed.wait(interval):
+      try:
+        self.sweep()
+      except sqlite3.Error:
+        pass # The database may be busy, try again on the next sweep
+
+  def preload(self, cache: Cache, limit: int = 1000) -> int:
+    """Copies the most recently used fresh results into another cache,
+    usually a :class:`MemoryCache` in front of this one. Returns the number of results copied"""
+    now = time.time()
+    rows = self._connection().execute(
+      "SELECT key, kind, data, COALESCE(fresh, expires) FROM responses"
+      " WHERE COALESCE(fresh, expires) > ? ORDER BY accessed DESC LIMIT ?",
+      (now, limit)
+    ).fetchall()
+    # Inserted least recently used first, so that the order of an LRU cache is preserved
+    for key, kind, data, fresh in reversed(rows):
+      cache.set(key, _loads(kind, data), ttl=fresh - now)
+    return len(rows)
+
+  def close(self):
+    """Stops the background sweep and closes every connection to the database"""
+    self._closed.set()
+    if self._sweeper is not None:
+      self._sweeper.join()
+    try:
+      self.sweep()
+    except sqlite3.Error:
+      pass
+    with self._lock:
+      connections, self._connections = self._connections, []
+    for conn in connections:
+      conn.close()
+    self._local = threading.local()
+
+
+
+class TieredCache(Cache):
+  """Chains several caches, usually a :class:`MemoryCache` in front of a :class:`SQLiteCache`
+
+  Lookups go through the caches in order, and a fresh result found in a later cache
+  is copied into the earlier ones. Results are stored in every cache.
+
+  Parameters
+  ----------
+  \*caches: :class:`Cache`
+    The caches to chain, fastest first.
+  """
+
+  def __init__(self, *caches: Cache):
+    if not caches:
+      raise ValueError("at least one cache is required")
+    self._caches: Tuple[Cache, ...] = caches
+
+  def __repr__(self):
+    return f"TieredCache{self._caches}"
+
+  @property
+  def caches(self) -> Tuple[Cache, ...]:
+    return self._caches
+
+  @property
+  def stats(self) -> CacheStats:
+    """The counters of the first cache"""
+    return self._caches[0].stats
+
+  def lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+    for i, cache in enumerate(self._caches):
+      value, stale = cache.lookup(key)
+      if value is not None:
+        if not stale:
+          for earlier in self._caches[:i]:
+            earlier.set(key, value)
+        return value, stale
+    return None, False
+
+  def set(self, key: str, value: Any, ttl: Optional[float] = None):
+    for cache in self._caches:
+      cache.set(key, value, ttl=ttl)
+
+  def delete(self, key: str):
+    for cache in self._caches:
+      cache.delete(key)
+
+  def clear(self):
+    for cache in self._caches:
+      cache.clear()
+
+
+
+_NEGATIVE_KINDS = ("error", "fallthrough")
+
+# The fraction of its maximum size a full SQLiteCache is evicted down to
+_LOW_WATER = 0.9
+
+
+def _default_ttl(value: Any, ttl: Optional[float], default: float, negative_default: float) -> float:
+  if ttl is not None:
+    return ttl
+  return negative_default if isinstance(value, NegativeResult) else default
+
+
+def _dumps(value: Any) -> Optional[Tuple[str, bytes]]:
+  """Serializes a result into its kind and data, or returns `None` if it cannot be stored"""
+  if isinstance(value, NegativeResult):
+    if value.exception is not None:
+      exc = value.exception
+      return "error", json.dumps(
+        {"type": type(exc).__name__, "args": [str(arg) for arg in exc.args]}
+      ).encode()
+    elif isinstance(value.result, FullResults):
+      return "fallthrough", json.dumps(value.result.raw, separators=(",", ":")).encode()
+    return None
+  elif isinstance(value, FullResults):
+    return "full", json.dumps(value.raw, separators=(",", ":")).encode()
+  elif isinstance(value, ConversationalResults):
+    return "conversational", json.dumps(value.raw, separators=(",", ":")).encode()
+  elif isinstance(value, SimpleImage):
+    return "image", value.data
+  elif isinstance(value, str):
+    return "text", value.encode()
+  return None
+
+
+def _loads(kind: str, data: bytes) -> Any:
+  """Deserializes a result stored by :func:`_dumps`"""
+  if kind == "error":
+    error = json.loads(data)
+    exc_type = getattr(exceptions, error["type"], WolframException)
+    return NegativeResult(exception=exc_type(*error["args"]))
+  elif kind == "fallthrough":
+    return NegativeResult(result=FullResults.from_dict(json.loads(data)))
+  elif kind == "full":
+    return FullResults.from_dict(json.loads(data))
+  elif kind == "conversational":
+    return ConversationalResults.from_dict(json.loads(data))
+  elif kind == "image":
+    return SimpleImage(bytes(data))
+  else:
+    return bytes(data).decode()
+
+
+def sizeof(value: Any) -> int:
+  """Returns the approximate memory used by a result, in bytes.
+  Models are measured by their decoded fields and what they kept of the raw response"""
+  if isinstance(value, NegativeResult):
+    return sys.getsizeof(value) + sizeof(value.exception or value.result)
+  elif isinstance(value, SimpleImage):
+    return sys.getsizeof(value.data)
+  else:
+    return _deep_sizeof(value, set())
+
+
+def _deep_sizeof(obj: Any, seen: Set[int]) -> int:
+  # Values shared by the fields of a model and its raw dictionary are only counted once
+  if id(obj) in seen:
+    return 0
+  seen.add(id(obj))
+  size = sys.getsizeof(obj)
+  if isinstance(obj, dict):
+    for k, v in obj.items():
+      size += _deep_sizeof(k, seen) + _deep_sizeof(v, seen)
+  elif isinstance(obj, (list, tuple)):
+    for v in obj:
+      size += _deep_sizeof(v, seen)
+  elif not isinstance(obj, type):
+    # Slots are read through their descriptors, as a missing attribute
+    # would otherwise decode the field of a lazily decoded model
+    for klass in type(obj).__mro__:
+      for name in vars(klass).get("__slots__", ()):
+        try:
+          size += _deep_sizeof(vars(klass)[name].__get__(obj, klass), seen)
+        except AttributeError:
+          pass
+    if hasattr(obj, "__dict__"):
+      size += _deep_sizeof(vars(obj), seen)
+  return size
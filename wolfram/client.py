@@ -1,18 +1,59 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional, Sequence, overload
-from urllib.parse import urlencode
-
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import (
+  TYPE_CHECKING,
+  Any,
+  AsyncIterable,
+  AsyncIterator,
+  Callable,
+  Dict,
+  Iterable,
+  Iterator,
+  List,
+  Mapping,
+  Optional,
+  Sequence,
+  Set,
+  Tuple,
+  Union,
+  overload
+)
+from urllib.parse import parse_qsl, quote_plus, urlencode
+
+from wolfram import decoder
 from wolfram.api import API, ConversationalAPI, FullResultsAPI, ShortAPI, SimpleAPI, SpokenAPI
-from wolfram.exceptions import MissingParameters, ParameterConflict
+from wolfram.appid import AppIDPool
+from wolfram.breaker import CircuitBreaker
+from wolfram.budget import PhaseTimings
+from wolfram.cache import Cache, NegativeResult
+from wolfram.decoder import JSONLoads
+from wolfram.exceptions import (
+  DeadlineExceeded,
+  InterpretationError,
+  InvalidAppID,
+  MissingParameters,
+  ParameterConflict,
+  WolframException
+)
+from wolfram.hedge import HedgePolicy
+from wolfram.models import BatchResult, ConversationalResults, FullResults, Pod
 from wolfram.params import Units
+from wolfram.ratelimit import RateLimiter
+from wolfram.retry import RetryPolicy, set_attempts
 
 if TYPE_CHECKING:
-  from wolfram.models import FullResults, ConversationalResults, SimpleImage
+  from wolfram.models import SimpleImage
   from wolfram.params import Bool, LatLong
 
 import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 
 
 class ClientBase:
@@ -24,20 +65,184 @@ class ClientBase:
     2: "v2/"
   }
 
-  def __init__(self, appid: str):
-    self._appid = appid
+  def __init__(
+    self,
+    appid: Union[str, AppIDPool],
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    cache: Optional[Cache] = None,
+    hedge_policy: Optional[HedgePolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    connect_timeout: Optional[float] = None,
+    read_timeout: Optional[float] = None,
+    total_timeout: Optional[float] = None,
+    json_loads: Optional[JSONLoads] = None
+  ):
+    self._appids = appid if isinstance(appid, AppIDPool) else AppIDPool([appid])
+    self._rate_limiter = rate_limiter
+    self._retry_policy = retry_policy
+    self._cache = cache
+    self._hedge_policy = hedge_policy
+    self._circuit_breaker = circuit_breaker
+    self._connect_timeout = connect_timeout
+    self._read_timeout = read_timeout
+    self._total_timeout = total_timeout
+    self._json_loads = json_loads if json_loads is not None else decoder.loads
+    self._phase_timings = PhaseTimings()
 
   @property
   def appid(self) -> str:
-    """The App ID in use by the client"""
-    return self._appid
+    """The App ID in use by the client, or the first App ID of its pool"""
+    return self._appids.appids[0]
 
+  @property
+  def appids(self) -> AppIDPool:
+    """The pool of App IDs in use by the client"""
+    return self._appids
 
+  @property
+  def rate_limiter(self) -> Optional[RateLimiter]:
+    """The rate limiter pacing requests made by the client, if any"""
+    return self._rate_limiter
 
-class Client(ClientBase):
-  """Client to interact with the APIs"""
+  @property
+  def retry_policy(self) -> Optional[RetryPolicy]:
+    """The policy used to retry failed requests, if any"""
+    return self._retry_policy
+
+  @property
+  def cache(self) -> Optional[Cache]:
+    """The cache results are stored in, if any"""
+    return self._cache
+
+  @property
+  def hedge_policy(self) -> Optional[HedgePolicy]:
+    """The policy used to hedge slow requests, if any"""
+    return self._hedge_policy
+
+  @property
+  def phase_timings(self) -> PhaseTimings:
+    """The timings of the FullResults API learned from the results received by the client,
+    used to split the `latency_budget` of queries"""
+    return self._phase_timings
+
+  @property
+  def circuit_breaker(self) -> Optional[CircuitBreaker]:
+    """The circuit breaker requests are sent through, if any"""
+    return self._circuit_breaker
 
-  def query(self, api: API, url: Optional[str] = None, **params):
+  @property
+  def json_loads(self) -> JSONLoads:
+    """The function JSON responses are decoded with"""
+    return self._json_loads
+
+  def _full_results_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Converts parameters to the form the FullResults API expects,
+    splitting the `latency_budget` into timeouts"""
+    params = dict(params)
+    latency_budget = params.pop("latency_budget", None)
+    if latency_budget is not None:
+      # Timeouts passed in explicitly are kept
+      params = {**self._phase_timings.split(latency_budget), **params}
+    # For some reason unlike the other APIs the FullResults API units parameter is metric or nonmetric
+    # instead of imperial, so we'll just do a replace if it is imperial
+    if params.get("units") == Units.IMPERIAL:
+      params["units"] = "nonmetric"
+    for name in ("format", "podindex"):
+      if params.get(name) is None:
+        params.pop(name, None)
+      elif not isinstance(params[name], str):
+        params[name] = ",".join(map(str, params[name]))
+    return params
+
+  def _pod_urls(
+    self,
+    url: Optional[str],
+    input: str,
+    pod_ids: Sequence[str],
+    params: Dict[str, Any]
+  ) -> Dict[str, str]:
+    """Returns the canonical url of the query for each single pod, which is the key it is cached under"""
+    if not pod_ids:
+      raise ValueError("at least one pod ID is required")
+    if "includepodid" in params:
+      raise ParameterConflict("cannot pass `includepodid` to a pod query")
+    return {
+      pod_id: self._build_url(FullResultsAPI, url, {"input": input, "includepodid": pod_id, **params})
+      for pod_id in pod_ids
+    }
+
+  def _cached_pods(self, pod_urls: Dict[str, str]) -> Tuple[Dict[str, FullResults], List[str]]:
+    """Looks up the result of each single pod in the cache,
+    returning the results found and the IDs of the pods that are missing"""
+    found = {}
+    missing = []
+    for pod_id, pod_url in pod_urls.items():
+      cached, stale = self._cache.lookup(pod_url) if self._cache is not None else (None, False)
+      if cached is None or stale:
+        missing.append(pod_id)
+      else:
+        found[pod_id] = cached.replay() if isinstance(cached, NegativeResult) else cached
+    return found, missing
+
+  def _split_pods(
+    self,
+    result: FullResults,
+    pod_urls: Dict[str, str],
+    missing: List[str]
+  ) -> Dict[str, FullResults]:
+    """Splits a result into one result per requested pod, storing each of them in the cache.
+    Pods that the API did not return are stored as results without pods"""
+    pods = {pod.id: pod for pod in result.pods or []}
+    split = {}
+    for pod_id in missing:
+      pod = pods.get(pod_id)
+      raw = dict(result.raw, pods=[pod.raw] if pod is not None else [])
+      raw["numpods"] = len(raw["pods"])
+      split[pod_id] = FullResults.from_dict(raw)
+      self._store(pod_urls[pod_id], split[pod_id])
+    return split
+
+  @staticmethod
+  def _merge_pods(results: List[FullResults]) -> FullResults:
+    """Merges the results of single pods into a new result, leaving them untouched as they may be cached"""
+    for result in results:
+      if not result.success:
+        return result
+    merged = FullResults.from_dict(dict(results[0].raw, pods=[], numpods=0))
+    for result in results:
+      for pod in result.pods or []:
+        merged.merge_pod(pod)
+    return merged
+
+  @staticmethod
+  def _cacheable(status: int, result: Any) -> bool:
+    """If a result is an answer that can be cached, rather than an error. Only results of
+    successful responses that do not report an error themselves, such as an invalid App ID, are"""
+    if not 200 <= status < 300:
+      return False
+    return not (isinstance(result, (FullResults, ConversationalResults)) and result.is_error)
+
+  @staticmethod
+  def _cut_short(deadline: Optional[_Deadline], result: Any = None) -> bool:
+    """If the outcome of a query, either its result or an interpretation error if `result`
+    is not given, may be due to timeouts lowered to fit its deadline. Such outcomes are not
+    cached, as the same query without a deadline could give a different one"""
+    if deadline is None or not deadline.lowered:
+      return False
+    if result is None:
+      return True
+    return isinstance(result, FullResults) and (not result.is_complete or result.is_fallthrough)
+
+  def _store(self, url: str, result: Any):
+    """Stores a result in the cache, fallthrough results being stored as negative results"""
+    if isinstance(result, FullResults) and result.is_fallthrough:
+      self._cache.set(url, NegativeResult(result=result))
+    else:
+      self._cache.set(url, result)
+
+  def _endpoint_url(self, api: API, url: Optional[str]) -> str:
+    """Returns the url of the endpoint of `api`, without any parameters"""
     if not issubclass(api, API):
       raise TypeError("api must be `API` type")
 
@@ -47,22 +252,562 @@ class Client(ClientBase):
 
     api_version = self.API_VERSION[api.VERSION]
 
+    base_url = url if url is not None else self.BASE_URL
+    return base_url + api_version + api.ENDPOINT
+
+  @staticmethod
+  def _merge_params(api: API, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the parameters of `api` merged with the given parameters"""
     try:
-      params = "?" + urlencode(
-        tuple(
-          dict(appid=self.appid, **api.PARAMS, **params).items()
-        )
-      )
+      params = dict(appid=None, **api.PARAMS, **params)
     except TypeError:
       raise ParameterConflict("cannot pass a parameter specified by `API` object")
 
-    base_url = url if url is not None else self.BASE_URL
-    url = base_url + api_version + api.ENDPOINT + params
-    resp = requests.get(url)
-    return api.format_results(resp)
+    # The App ID is only added when a request is sent, so that
+    # the same query always produces the same url whichever App ID is used
+    del params["appid"]
+    return params
+
+  def _build_url(self, api: API, url: Optional[str], params: Dict[str, Any]) -> str:
+    """Returns the canonical url to query `api` with the given parameters"""
+    endpoint = self._endpoint_url(api, url)
+    # Parameters are sorted so that the same query always produces the same url,
+    # and sequences are sent as repeated parameters
+    return endpoint + "?" + urlencode(sorted(self._merge_params(api, params).items()), doseq=True)
+
+  def prepare(self, api: API, url: Optional[str] = None, **params) -> PreparedQuery:
+    """Prepares a query to `api` with fixed parameters, so that only the input changes
+    between calls. The url of the query is encoded once, instead of on every call.
+
+    Parameters
+    ----------
+    api: Type[:class:`~wolfram.api.API`]
+      The API to query.
+    url: Optional[`str`]
+      The host url to send queries to. Defaults to the Wolfram|Alpha API.
+    \*\*params
+      The parameters shared by every query, which cannot include the input of the API.
+      Parameters of the Full Results API are converted as in :meth:`full_results_query`,
+      a `latency_budget` being split into timeouts once, when the query is prepared.
+
+    Raises
+    ------
+    ~wolfram.ParameterConflict
+      A parameter specified by the API, or the input of the API, was passed in.
+    """
+    endpoint = self._endpoint_url(api, url)
+    if issubclass(api, FullResultsAPI):
+      params = self._full_results_params(params)
+    params = self._merge_params(api, params)
+    if api.INPUT in params:
+      raise ParameterConflict(f"cannot pass the input parameter `{api.INPUT}` to a prepared query")
+
+    # The input is encoded in its sorted position, so that prepared
+    # queries produce the same urls as regular ones and share their cache entries
+    items = sorted(params.items())
+    head = [(key, value) for key, value in items if key < api.INPUT]
+    tail = [(key, value) for key, value in items if key > api.INPUT]
+    prefix = endpoint + "?"
+    if head:
+      prefix += urlencode(head, doseq=True) + "&"
+    suffix = "&" + urlencode(tail, doseq=True) if tail else ""
+    return PreparedQuery(self, api, prefix + api.INPUT + "=", suffix)
+
+  def _deadline(self, deadline: Optional[float]) -> Optional[_Deadline]:
+    """Starts the deadline of a query, defaulting to the total timeout of the client"""
+    timeout = deadline if deadline is not None else self._total_timeout
+    return _Deadline(timeout) if timeout is not None else None
+
+  @staticmethod
+  def _request_url(api: API, url: str, appid: str, deadline: Optional[_Deadline] = None) -> str:
+    """Returns the url a request is sent to with the given App ID. If the query has a deadline,
+    the timeouts of the API are lowered to the time left before it, so that it does not
+    keep working on a result that would be thrown away"""
+    url = url + "&appid=" + quote_plus(appid)
+    if deadline is None or not api.TIMEOUT_PARAMS:
+      return url
+    remaining = deadline.remaining()
+
+    base, query = url.split("?", 1)
+    # Parameters such as `includepodid` can be repeated, so they are kept as pairs
+    params = parse_qsl(query)
+    values = dict(params)
+    lowered = {
+      name: f"{max(remaining, 0.1):.1f}"
+      for name, default in api.TIMEOUT_PARAMS.items()
+      if remaining < float(values.get(name, default))
+    }
+    if not lowered:
+      return url
+    deadline.lowered = True
+    params = [(name, value) for name, value in params if name not in lowered]
+    return base + "?" + urlencode(params + list(lowered.items()))
+
+  @contextmanager
+  def _call(self, url: str, deadline: Optional[_Deadline] = None) -> Iterator[_Call]:
+    """Guards a single request with the circuit breaker, if any. The status
+    code of the response should be set on the yielded call once it is received"""
+    breaker = self._circuit_breaker
+    call = _Call()
+    if breaker is None:
+      yield call
+      return
+
+    # The url without its parameters identifies both the base url and the API
+    endpoint = url.split("?", 1)[0]
+    token = breaker.before(endpoint)
+    start = time.monotonic()
+    try:
+      yield call
+    except Exception as e:
+      if deadline is not None and deadline.expired and not isinstance(e, WolframException):
+        # The request most likely timed out because of the deadline of the query, not the API
+        breaker.release(endpoint, token)
+      else:
+        # Errors reported by the API, such as inputs it could not interpret, mean that it is up
+        breaker.record(endpoint, isinstance(e, WolframException), time.monotonic() - start, token)
+      raise
+    except BaseException:
+      breaker.release(endpoint, token)
+      raise
+    breaker.record(endpoint, call.ok, time.monotonic() - start, token)
+
+  def _invalidate(self, appid: str, result: Any = None) -> bool:
+    """Takes an App ID reported as invalid out of rotation, either because the API raised
+    :class:`~wolfram.exceptions.InvalidAppID` or because `result` has an invalid App ID error.
+    Returns whether the request can be sent again with another App ID"""
+    if len(self._appids) == 1:
+      # A lone App ID is never taken out of rotation, so errors are still reported by the API
+      return False
+    if result is not None and not (
+      isinstance(result, FullResults) and result.is_error and result.error.code == 1
+    ):
+      return False
+    return self._appids.invalidate(appid)
+
+  @staticmethod
+  def _batch_params(
+    api: API,
+    item: Union[str, Mapping[str, Any]],
+    params: Dict[str, Any]
+  ) -> Dict[str, Any]:
+    """Returns the parameters to query a single batch item with.
+    A string is sent as the input of the API, while a mapping is
+    sent as parameters overriding the ones shared by the batch"""
+    if isinstance(item, str):
+      return {**params, api.INPUT: item}
+    else:
+      return {**params, **item}
+
+
+
+class Client(ClientBase):
+  """Client to interact with the APIs
+
+  The client owns a pooled :class:`requests.Session`, so connections to the API
+  are kept alive and reused between queries. A single client can be shared between
+  many threads, and should be closed with :meth:`close` (or used as a context manager)
+  once it is no longer needed.
+
+  Parameters
+  ----------
+  appid: Union[`str`, :class:`~wolfram.appid.AppIDPool`]
+    The App ID used to authenticate queries, or a pool of App IDs to spread
+    queries across. An App ID reported as invalid by the API is taken out of
+    the pool, and the query is sent again with another one.
+  session: Optional[:class:`requests.Session`]
+    A session to send requests with. If provided, the client will not mount
+    its own adapter on it, and will not close it in :meth:`close`.
+  pool_connections: `int`
+    The number of per-host connection pools to keep. Defaults to `10`.
+  pool_maxsize: `int`
+    The maximum number of connections kept alive per host. Defaults to `10`.
+  pool_block: `bool`
+    Whether to block when every connection to a host is in use, instead of
+    opening a connection that is discarded after use. Defaults to `False`.
+  keep_alive: `bool`
+    Whether connections should be kept alive between queries. Defaults to `True`.
+  max_workers: Optional[`int`]
+    The number of threads in the pool used by :meth:`batch_query`.
+    Defaults to `pool_maxsize`, so that every thread can hold a connection.
+  rate_limiter: Optional[:class:`~wolfram.ratelimit.RateLimiter`]
+    A rate limiter to pace requests with. Every request blocks until the
+    limiter grants a slot for the App ID in use. The same limiter can be
+    shared with other clients.
+  retry_policy: Optional[:class:`~wolfram.retry.RetryPolicy`]
+    The policy used to retry requests that failed because of connection
+    errors, timeouts or server errors. Requests are not retried by default.
+  cache: Optional[:class:`~wolfram.cache.Cache`]
+    A cache to store results in, keyed on the url of the query. Inputs that
+    could not be interpreted and fallthrough results are cached as negative
+    results, which are replayed without sending the query again. Stale results
+    are served while they are refreshed in the background.
+    Results are not cached by default.
+  hedge_policy: Optional[:class:`~wolfram.hedge.HedgePolicy`]
+    The policy used to send a second, identical request when a response is slow
+    to arrive, using whichever finishes first. Requests are not hedged by default.
+  circuit_breaker: Optional[:class:`~wolfram.breaker.CircuitBreaker`]
+    A circuit breaker to send requests through. While the circuit of an API is open,
+    queries to it raise :class:`~wolfram.exceptions.CircuitOpen` without being sent.
+    The same breaker can be shared with other clients.
+  connect_timeout: Optional[`float`]
+    How long to wait for a connection to the API, in seconds. Defaults to `10`.
+  read_timeout: Optional[`float`]
+    How long to wait for the API to send data, in seconds. Defaults to `30`.
+  total_timeout: Optional[`float`]
+    How long a whole query can take, including retries and waiting for the rate limiter,
+    in seconds. This is the deadline of queries sent without one. Defaults to no limit.
+  json_loads: Optional[Callable[[`bytes`], Any]]
+    The function JSON responses are decoded with, straight from the bytes of the response.
+    Defaults to orjson or msgspec if installed, and to the standard library otherwise.
+    See :func:`~wolfram.decoder.get_loads` to pick a backend.
+
+  Every query also accepts a `deadline` keyword argument, the number of seconds it has to
+  finish in. A query that does not finish in time raises :class:`~wolfram.exceptions.DeadlineExceeded`,
+  and the timeouts sent to the API are lowered to the time left before the deadline.
+  """
+
+  def __init__(
+    self,
+    appid: Union[str, AppIDPool],
+    *,
+    session: Optional[requests.Session] = None,
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    pool_block: bool = False,
+    keep_alive: bool = True,
+    max_workers: Optional[int] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    cache: Optional[Cache] = None,
+    hedge_policy: Optional[HedgePolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    connect_timeout: Optional[float] = 10,
+    read_timeout: Optional[float] = 30,
+    total_timeout: Optional[float] = None,
+    json_loads: Optional[JSONLoads] = None
+  ):
+    super().__init__(
+      appid,
+      rate_limiter=rate_limiter,
+      retry_policy=retry_policy,
+      cache=cache,
+      hedge_policy=hedge_policy,
+      circuit_breaker=circuit_breaker,
+      connect_timeout=connect_timeout,
+      read_timeout=read_timeout,
+      total_timeout=total_timeout,
+      json_loads=json_loads
+    )
+    self._max_workers = max_workers if max_workers is not None else pool_maxsize
+    self._executor: Optional[ThreadPoolExecutor] = None
+    self._hedge_executor: Optional[ThreadPoolExecutor] = None
+    self._revalidating: Set[str] = set()
+    self._lock = threading.Lock()
+    self._owns_session = session is None
+    if session is None:
+      session = requests.Session()
+      adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block
+      )
+      session.mount("https://", adapter)
+      session.mount("http://", adapter)
+      if not keep_alive:
+        session.headers["Connection"] = "close"
+    self._session = session
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self.close()
+
+  @property
+  def session(self) -> requests.Session:
+    """The session used to send requests"""
+    return self._session
+
+  @property
+  def executor(self) -> ThreadPoolExecutor:
+    """The thread pool used to run queries in the background, created on first access"""
+    with self._lock:
+      if self._executor is None:
+        self._executor = ThreadPoolExecutor(
+          max_workers=self._max_workers,
+          thread_name_prefix="wolfram"
+        )
+      return self._executor
+
+  @property
+  def hedge_executor(self) -> ThreadPoolExecutor:
+    """The thread pool hedged copies of requests and deferred pods are sent from, created on first access.
+    It is separate from :attr:`executor` so that queries running in that pool
+    never wait for threads of their own pool"""
+    with self._lock:
+      if self._hedge_executor is None:
+        self._hedge_executor = ThreadPoolExecutor(
+          max_workers=self._max_workers * 2,
+          thread_name_prefix="wolfram-hedge"
+        )
+      return self._hedge_executor
+
+  def close(self):
+    """Shuts down the thread pools and closes the underlying session,
+    if it is owned by the client"""
+    with self._lock:
+      executors = (self._executor, self._hedge_executor)
+      self._executor = self._hedge_executor = None
+    for executor in executors:
+      if executor is not None:
+        executor.shutdown(wait=True)
+    if self._owns_session:
+      self._session.close()
+
+  def query(self, api: API, url: Optional[str] = None, *, deadline: Optional[float] = None, **params):
+    return self._query(api, self._build_url(api, url, params), deadline)
+
+  def _query(self, api: API, url: str, deadline: Optional[float] = None):
+    if self._cache is not None:
+      cached, stale = self._cache.lookup(url)
+      if cached is not None:
+        if stale:
+          self._revalidate(api, url)
+        return cached.replay() if isinstance(cached, NegativeResult) else cached
+    return self._fetch(api, url, self._deadline(deadline))
+
+  def _revalidate(self, api: API, url: str):
+    """Refreshes a stale result using the thread pool, unless it is already being refreshed.
+    If the refresh fails, the stale result keeps being served until it expires"""
+    with self._lock:
+      if url in self._revalidating:
+        return
+      self._revalidating.add(url)
+
+    def done(_):
+      with self._lock:
+        self._revalidating.discard(url)
+
+    self.executor.submit(self._fetch, api, url, self._deadline(None)).add_done_callback(done)
+
+  def _fetch(self, api: API, url: str, deadline: Optional[_Deadline] = None):
+    try:
+      result, status = self._request(api, url, deadline)
+    except InterpretationError as e:
+      if self._cache is not None and not self._cut_short(deadline):
+        self._cache.set(url, NegativeResult(exception=e))
+      raise
+    # Other failures are never cached, so that they are not served once the API recovers
+    if self._cache is not None and self._cacheable(status, result) and not self._cut_short(deadline, result):
+      self._store(url, result)
+    return result
+
+  def _request(self, api: API, url: str, deadline: Optional[_Deadline] = None) -> Tuple[Any, int]:
+    """Sends a query, retrying it as needed, and returns its result along with the status code of its response"""
+    retry = self._retry_policy
+    attempt = 0 # Every request sent
+    tries = 1 # Only the requests counted by the retry policy
+    try:
+      while True:
+        remaining = deadline.remaining() if deadline is not None else None
+        appid = self._appids.acquire()
+        if self._rate_limiter is not None:
+          self._rate_limiter.acquire(appid, remaining)
+        attempt += 1
+        try:
+          result, status, delay = self._send(api, url, appid, tries, deadline)
+          if delay is None:
+            if self._invalidate(appid, result):
+              continue
+            if isinstance(result, FullResults):
+              self._phase_timings.record(result)
+            return set_attempts(result, attempt), status
+        except InvalidAppID:
+          # Another App ID from the pool is tried straight away
+          if not self._invalidate(appid):
+            raise
+          continue
+        except Exception as e:
+          if deadline is not None and deadline.expired and not isinstance(e, WolframException):
+            # The request most likely timed out because of the deadline
+            raise DeadlineExceeded("query did not finish before its deadline") from e
+          if retry is None or not retry.retry_exception(tries, e):
+            raise
+          delay = retry.backoff(tries)
+        if deadline is not None and delay >= deadline.remaining():
+          raise DeadlineExceeded("query cannot be retried before its deadline")
+        time.sleep(delay)
+        tries += 1
+    finally:
+      if retry is not None:
+        retry.record(attempt)
+
+  def _attempt(
+    self,
+    api: API,
+    url: str,
+    appid: str,
+    tries: int,
+    deadline: Optional[_Deadline] = None
+  ) -> Tuple[Any, int, Optional[float]]:
+    """Sends a single request, returning either its result and status code,
+    or its status code and how long to wait before it is retried"""
+    retry = self._retry_policy
+    remaining = deadline.remaining() if deadline is not None else None
+    timeout = (
+      _bound(self._connect_timeout, remaining),
+      _bound(self._read_timeout, remaining)
+    )
+    request_url = self._request_url(api, url, appid, deadline)
+    with self._call(url, deadline) as call, self._session.get(request_url, timeout=timeout) as resp:
+      call.status = resp.status_code
+      if retry is None or not retry.retry_status(tries, resp.status_code):
+        return api.format_results(resp, self._json_loads), resp.status_code, None
+      return None, resp.status_code, retry.backoff(tries, resp.headers)
+
+  def _hedge_slot(self, appid: str) -> bool:
+    """Takes a slot of the rate limiter for a hedged request, returning
+    whether one was available without waiting"""
+    if self._rate_limiter is None:
+      return True
+    try:
+      self._rate_limiter.acquire(appid, 0)
+    except DeadlineExceeded:
+      return False
+    return True
+
+  def _send(
+    self,
+    api: API,
+    url: str,
+    appid: str,
+    tries: int,
+    deadline: Optional[_Deadline] = None
+  ) -> Tuple[Any, int, Optional[float]]:
+    """Sends a single request, hedging it if it is slow"""
+    hedge = self._hedge_policy
+    if hedge is None:
+      return self._attempt(api, url, appid, tries, deadline)
+
+    start = time.monotonic()
+    delay = hedge.delay()
+    if delay is None:
+      # Nothing is hedged until enough latencies have been observed, so the request is sent inline
+      result = self._attempt(api, url, appid, tries, deadline)
+      hedge.record(time.monotonic() - start)
+      return result
+
+    # The primary request gets a thread of its own, as the calling thread has to stay free
+    # to return the result of a hedged request that wins. Queuing it in the pool would cap the
+    # number of concurrent queries and count the time spent waiting for a thread towards the delay
+    primary = _spawn(self._attempt, api, url, appid, tries, deadline)
+    pending = {primary}
+    try:
+      done, _ = wait(pending, timeout=delay)
+      if not done and hedge.try_hedge():
+        if self._hedge_slot(appid):
+          self._appids.use(appid)
+          pending.add(self.hedge_executor.submit(self._attempt, api, url, appid, tries, deadline))
+        else:
+          hedge.release()
+
+      error = None
+      while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+          if future.exception() is None:
+            hedge.record(time.monotonic() - start, hedge_won=future is not primary)
+            return future.result()
+          error = error or future.exception()
+      raise error
+    finally:
+      # A request that is already being sent cannot be stopped, its response is discarded
+      for future in pending:
+        future.cancel()
+
+  def _batch_item(self, api: API, index: int, item, params: Dict[str, Any]) -> BatchResult:
+    try:
+      result = self.query(api, **self._batch_params(api, item, params))
+    except Exception as e:
+      return BatchResult(index, item, exception=e)
+    else:
+      return BatchResult(index, item, result=result)
+
+  def batch_query(
+    self,
+    api: API,
+    inputs: Iterable,
+    *,
+    max_workers: Optional[int] = None,
+    ordered: bool = True,
+    **params
+  ) -> Iterator[BatchResult]:
+    """
+    
+    Send a query for every item of `inputs` using the client's thread pool,
+    yielding a :class:`~wolfram.models.BatchResult` for each of them.
+
+    Queries are only submitted when iterating over the returned iterator.
+    At most `max_workers` queries are in flight at once, and items are only
+    pulled from `inputs` when there is room for them, so memory use stays bounded
+    regardless of how long `inputs` is. A query that fails does not stop the batch,
+    instead the exception is stored on its result.
+
+    Parameters
+    ----------
+    api: :class:`~wolfram.api.API`
+      The API to query.
+    inputs: Iterable
+      The items to query. A `str` is sent as the input of the API, while a
+      mapping is sent as the parameters of that query.
+    max_workers: Optional[`int`]
+      The maximum number of queries in flight at once.
+      Defaults to the size of the client's thread pool.
+    ordered: `bool`
+      Whether results are yielded in input order. If `False`, they are
+      yielded as soon as their query finishes. Defaults to `True`.
+    \*\*params
+      Parameters shared by every query in the batch.
+    """
+    if max_workers is None:
+      max_workers = self._max_workers
+    elif max_workers < 1:
+      raise ValueError("max_workers must be at least 1")
+
+    executor = self.executor
+    items = iter(inputs)
+    pending = deque() if ordered else set()
+    index = 0
+    exhausted = False
+    try:
+      while True:
+        while not exhausted and len(pending) < max_workers:
+          try:
+            item = next(items)
+          except StopIteration:
+            exhausted = True
+          else:
+            future = executor.submit(self._batch_item, api, index, item, params)
+            if ordered:
+              pending.append(future)
+            else:
+              pending.add(future)
+            index += 1
+        if not pending:
+          break
+        if ordered:
+          yield pending.popleft().result()
+        else:
+          done, pending = wait(pending, return_when=FIRST_COMPLETED)
+          for future in done:
+            yield future.result()
+    finally:
+      for future in pending:
+        future.cancel()
 
   # NOTE: Not all parameters are supported
-  # Additionally, parameters produced by timeout and async related params are not easily accessible atm
+  # Additionally, the asynchronous mode of the FullResults API is only available through `full_results_stream`
   @overload
   def full_results_query(
     self,
@@ -75,6 +820,12 @@ class Client(ClientBase):
     ignorecase: Optional[Bool] = None,
     assumption: Optional[str] = None,
     units: Optional[Units] = None,
+    scantimeout: Optional[float] = None,
+    podtimeout: Optional[float] = None,
+    formattimeout: Optional[float] = None,
+    parsetimeout: Optional[float] = None,
+    totaltimeout: Optional[float] = None,
+    latency_budget: Optional[float] = None,
     **params
   ) -> FullResults:
     ...
@@ -92,6 +843,12 @@ class Client(ClientBase):
     ignorecase: Optional[Bool] = None,
     assumption: Optional[str] = None,
     units: Optional[Units] = None,
+    scantimeout: Optional[float] = None,
+    podtimeout: Optional[float] = None,
+    formattimeout: Optional[float] = None,
+    parsetimeout: Optional[float] = None,
+    totaltimeout: Optional[float] = None,
+    latency_budget: Optional[float] = None,
     **params
   ) -> FullResults:
     ...
@@ -109,6 +866,12 @@ class Client(ClientBase):
     ignorecase: Optional[Bool] = None,
     assumption: Optional[str] = None,
     units: Optional[Units] = None,
+    scantimeout: Optional[float] = None,
+    podtimeout: Optional[float] = None,
+    formattimeout: Optional[float] = None,
+    parsetimeout: Optional[float] = None,
+    totaltimeout: Optional[float] = None,
+    latency_budget: Optional[float] = None,
     **params
   ) -> FullResults:
     ...
@@ -126,6 +889,12 @@ class Client(ClientBase):
     ignorecase: Optional[Bool] = None,
     assumption: Optional[str] = None,
     units: Optional[Units] = None,
+    scantimeout: Optional[float] = None,
+    podtimeout: Optional[float] = None,
+    formattimeout: Optional[float] = None,
+    parsetimeout: Optional[float] = None,
+    totaltimeout: Optional[float] = None,
+    latency_budget: Optional[float] = None,
     **params
   ) -> FullResults:
     ...
@@ -164,23 +933,188 @@ class Client(ClientBase):
       Specifies an assumption, such as the meaning of a word or the value of a formula variable.
     units: Optional[:class:`~wolfram.Units`]
       Lets you specify the preferred measurement system, either "metric" or "imperial" (US customary units).
+    scantimeout: Optional[`float`]
+      The number of seconds to allow Wolfram|Alpha to compute results in the "scan" stage of processing.
+    podtimeout: Optional[`float`]
+      The number of seconds to allow Wolfram|Alpha to spend in the "format" stage for any one pod.
+    formattimeout: Optional[`float`]
+      The number of seconds to allow Wolfram|Alpha to spend in the "format" stage for the entire collection of pods.
+    parsetimeout: Optional[`float`]
+      The number of seconds to allow Wolfram|Alpha to spend in the "parsing" stage of processing.
+    totaltimeout: Optional[`float`]
+      The total number of seconds to allow Wolfram|Alpha to spend on a query.
+    latency_budget: Optional[`float`]
+      The number of seconds Wolfram|Alpha should spend on the query, split among the
+      timeouts above using the timings of past results. Timeouts passed in explicitly are kept.
+      Pods that were cut off are reported by :attr:`~wolfram.models.FullResults.timedout_pods`.
     \*\*params
       A keyword argument list of other parameters to be passed to the API.
       All parameters can be found at https://products.wolframalpha.com/api/documentation?scrollTo=parameter-reference.
     """
 
-    # For some reason unlike the other APIs the FullResults API units parameter is metric or nonmetric
-    # instead of imperial, so we'll just do a replace if it is imperial
-    units = params.get("units", None)
-    if units is not None and units == Units.IMPERIAL:
-      params["units"] == "nonmetric"
+    return self.query(api=FullResultsAPI, input=input, **self._full_results_params(params))
 
-    format = params.pop("format", None)
+  def full_results_pods(
+    self,
+    input: str,
+    pod_ids: Sequence[str],
+    *,
+    url: Optional[str] = None,
+    deadline: Optional[float] = None,
+    **params
+  ) -> FullResults:
+    """
+    
+    Send a query to the Wolfram|Alpha FullResults API for only the given pods.
 
-    if format is not None:
-      return self.query(api=FullResultsAPI, input=input, format=",".join(format), **params)
-    else:
-      return self.query(api=FullResultsAPI, input=input, **params)
+    Only the requested pods are computed and sent by the API, which is faster than a full query.
+    With a cache, the result of every pod is cached separately, so that later queries
+    only fetch the pods that are not cached yet. The pods are merged into a single result,
+    in position order.
+
+    Parameters
+    ----------
+    input: `str`
+      The input string to be interpreted.
+    pod_ids: Sequence[`str`]
+      The IDs of the pods to return, such as `"Result"`.
+    url: Optional[`str`]
+      The host url to send the query to. Defaults to the Wolfram|Alpha API.
+    deadline: Optional[`float`]
+      The number of seconds the query has to finish in.
+    \*\*params
+      A keyword argument list of other parameters to be passed to the API,
+      the same as :meth:`full_results_query`.
+
+    Raises
+    ------
+    ~wolfram.InterpretationError
+      Input was unable to be interpreted by the API.
+    ~wolfram.ParameterConflict
+      The `includepodid` parameter was passed in.
+    """
+    params = self._full_results_params(params)
+    pod_urls = self._pod_urls(url, input, pod_ids, params)
+    found, missing = self._cached_pods(pod_urls)
+    if missing:
+      query_url = self._build_url(FullResultsAPI, url, {"input": input, "includepodid": missing, **params})
+      query_deadline = self._deadline(deadline)
+      try:
+        result, status = self._request(FullResultsAPI, query_url, query_deadline)
+      except InterpretationError as e:
+        if self._cache is not None and not self._cut_short(query_deadline):
+          for pod_id in missing:
+            self._cache.set(pod_urls[pod_id], NegativeResult(exception=e))
+        raise
+      if (
+        self._cache is None
+        or not self._cacheable(status, result)
+        or self._cut_short(query_deadline, result)
+      ):
+        return result
+      found.update(self._split_pods(result, pod_urls, missing))
+    return self._merge_pods([found[pod_id] for pod_id in pod_ids])
+
+  def full_results_stream(
+    self,
+    input: str,
+    *,
+    async_timeout: Optional[float] = None,
+    url: Optional[str] = None,
+    deadline: Optional[float] = None,
+    **params
+  ) -> Iterator[FullResults]:
+    """
+    
+    Send an asynchronous query to the Wolfram|Alpha FullResults API, yielding the result as pods arrive.
+
+    Pods that are slow to compute are deferred by the API, and fetched concurrently.
+    The result is yielded as soon as the other pods arrive, then again every time a deferred pod
+    has been fetched and merged into :attr:`~wolfram.models.FullResults.pods`, in position order.
+    Deferred pods that fail to be fetched are left as they are. Streamed results are not cached.
+
+    Parameters
+    ----------
+    input: `str`
+      The input string to be interpreted.
+    async_timeout: Optional[`float`]
+      How long the API works on pods before deferring them, in seconds.
+      Defaults to the API's own timeout.
+    url: Optional[`str`]
+      The host url to send the query to. Defaults to the Wolfram|Alpha API.
+    deadline: Optional[`float`]
+      The number of seconds the query, including deferred pods, has to finish in.
+    \*\*params
+      A keyword argument list of other parameters to be passed to the API,
+      the same as :meth:`full_results_query`.
+    """
+    params = self._full_results_params(params)
+    params["async"] = "true" if async_timeout is None else async_timeout
+
+    query_deadline = self._deadline(deadline)
+    query_url = self._build_url(FullResultsAPI, url, {"input": input, **params})
+    result, _ = self._request(FullResultsAPI, query_url, query_deadline)
+    yield result
+
+    executor = self.hedge_executor
+    pending = {
+      executor.submit(self._fetch_pod, pod.deferred_url, query_deadline)
+      for pod in result.deferred
+    }
+    try:
+      for future in as_completed(pending):
+        pending.discard(future)
+        if future.exception() is None:
+          result.merge_pod(future.result())
+          yield result
+    finally:
+      for future in pending:
+        future.cancel()
+
+  def follow_recalculate(self, result: FullResults, *, deadline: Optional[float] = None) -> Future:
+    """Follows the :attr:`~wolfram.models.FullResults.recalculate` url of a result in the background,
+    for the pods that timed out during the first pass of the query.
+
+    The late pods are merged into `result` itself, in position order. The returned future
+    resolves to `result` once they are merged, straight away if there is nothing to recalculate.
+
+    Parameters
+    ----------
+    result: :class:`~wolfram.models.FullResults`
+      The first-pass result of a query.
+    deadline: Optional[`float`]
+      The number of seconds the recalculation has to finish in.
+    """
+    if not result.recalculate:
+      future = Future()
+      future.set_result(result)
+      return future
+    return self.executor.submit(self._recalculate, result, self._deadline(deadline))
+
+  def _recalculate(self, result: FullResults, deadline: Optional[_Deadline] = None) -> FullResults:
+    remaining = deadline.remaining() if deadline is not None else None
+    timeout = (
+      _bound(self._connect_timeout, remaining),
+      _bound(self._read_timeout, remaining)
+    )
+    try:
+      with self._session.get(result.recalculate.url, timeout=timeout) as resp:
+        result.merge_recalculated(FullResultsAPI.format_results(resp, self._json_loads))
+    except Exception as e:
+      if deadline is not None and deadline.expired:
+        raise DeadlineExceeded("recalculation did not finish before its deadline") from e
+      raise
+    return result
+
+  def _fetch_pod(self, url: str, deadline: Optional[_Deadline] = None) -> Pod:
+    """Fetches the contents of a deferred pod"""
+    remaining = deadline.remaining() if deadline is not None else None
+    timeout = (
+      _bound(self._connect_timeout, remaining),
+      _bound(self._read_timeout, remaining)
+    )
+    with self._session.get(url, timeout=timeout) as resp:
+      return FullResultsAPI.format_pod(resp, self._json_loads)
 
   @overload
   def conversational_query(
@@ -438,36 +1372,478 @@ class Client(ClientBase):
 
 
 class AsyncClient(ClientBase):
-  """Async client to interact with the APIs, powered by aiohttp"""
+  """Async client to interact with the APIs, powered by aiohttp
+
+  The client lazily creates a single :class:`aiohttp.ClientSession` the first time
+  it is used, and reuses its connection pool and DNS cache for every query after that.
+  It should be closed with :meth:`aclose` (or used as an async context manager)
+  once it is no longer needed.
+
+  Parameters
+  ----------
+  appid: Union[`str`, :class:`~wolfram.appid.AppIDPool`]
+    The App ID used to authenticate queries, or a pool of App IDs to spread
+    queries across. An App ID reported as invalid by the API is taken out of
+    the pool, and the query is sent again with another one.
+  session: Optional[:class:`aiohttp.ClientSession`]
+    A session to send requests with. If provided, the connector options
+    are ignored and the session will not be closed in :meth:`aclose`.
+  limit: `int`
+    The total number of simultaneous connections. Defaults to `100`.
+  limit_per_host: `int`
+    The number of simultaneous connections to a single host,
+    `0` means no limit. Defaults to `0`.
+  ttl_dns_cache: Optional[`int`]
+    How long resolved DNS entries are cached for, in seconds.
+    `None` caches them forever. Defaults to `10`.
+  keepalive_timeout: `float`
+    How long an idle connection is kept alive for, in seconds. Defaults to `15`.
+  coalesce: `bool`
+    Whether concurrent queries for the same url share a single request and result.
+    Cancelling one of the queries does not affect the others. Queries given a `deadline`
+    always send a request of their own. Defaults to `True`.
+  rate_limiter: Optional[:class:`~wolfram.ratelimit.RateLimiter`]
+    A rate limiter to pace requests with. Every request waits until the
+    limiter grants a slot for the App ID in use. The same limiter can be
+    shared with other clients.
+  retry_policy: Optional[:class:`~wolfram.retry.RetryPolicy`]
+    The policy used to retry requests that failed because of connection
+    errors, timeouts or server errors. Requests are not retried by default.
+  cache: Optional[:class:`~wolfram.cache.Cache`]
+    A cache to store results in, keyed on the url of the query. Inputs that
+    could not be interpreted and fallthrough results are cached as negative
+    results, which are replayed without sending the query again. Stale results
+    are served while they are refreshed in the background.
+    Results are not cached by default.
+  hedge_policy: Optional[:class:`~wolfram.hedge.HedgePolicy`]
+    The policy used to send a second, identical request when a response is slow
+    to arrive, using whichever finishes first. Requests are not hedged by default.
+  circuit_breaker: Optional[:class:`~wolfram.breaker.CircuitBreaker`]
+    A circuit breaker to send requests through. While the circuit of an API is open,
+    queries to it raise :class:`~wolfram.exceptions.CircuitOpen` without being sent.
+    The same breaker can be shared with other clients.
+  connect_timeout: Optional[`float`]
+    How long to wait for a connection to the API, in seconds. Defaults to `10`.
+  read_timeout: Optional[`float`]
+    How long to wait for the API to send data, in seconds. Defaults to `30`.
+  total_timeout: Optional[`float`]
+    How long a whole query can take, including retries and waiting for the rate limiter,
+    in seconds. This is the deadline of queries sent without one. Defaults to no limit.
+  json_loads: Optional[Callable[[`bytes`], Any]]
+    The function JSON responses are decoded with, straight from the bytes of the response.
+    Defaults to orjson or msgspec if installed, and to the standard library otherwise.
+    See :func:`~wolfram.decoder.get_loads` to pick a backend.
+
+  Every query also accepts a `deadline` keyword argument, the number of seconds it has to
+  finish in. A query that does not finish in time raises :class:`~wolfram.exceptions.DeadlineExceeded`,
+  and the timeouts sent to the API are lowered to the time left before the deadline.
+  """
+
+  def __init__(
+    self,
+    appid: Union[str, AppIDPool],
+    *,
+    session: Optional[aiohttp.ClientSession] = None,
+    limit: int = 100,
+    limit_per_host: int = 0,
+    ttl_dns_cache: Optional[int] = 10,
+    keepalive_timeout: float = 15,
+    coalesce: bool = True,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    cache: Optional[Cache] = None,
+    hedge_policy: Optional[HedgePolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    connect_timeout: Optional[float] = 10,
+    read_timeout: Optional[float] = 30,
+    total_timeout: Optional[float] = None,
+    json_loads: Optional[JSONLoads] = None
+  ):
+    super().__init__(
+      appid,
+      rate_limiter=rate_limiter,
+      retry_policy=retry_policy,
+      cache=cache,
+      hedge_policy=hedge_policy,
+      circuit_breaker=circuit_breaker,
+      connect_timeout=connect_timeout,
+      read_timeout=read_timeout,
+      total_timeout=total_timeout,
+      json_loads=json_loads
+    )
+    self._owns_session = session is None
+    self._session = session
+    self._connector_options = dict(
+      limit=limit,
+      limit_per_host=limit_per_host,
+      ttl_dns_cache=ttl_dns_cache,
+      keepalive_timeout=keepalive_timeout
+    )
+    self._inflight = 0
+    self._drained: Optional[asyncio.Event] = None
+    self._coalesce = coalesce
+    self._flights: Dict[Tuple[API, str], _Flight] = {}
+    self._revalidating: Dict[str, asyncio.Task] = {}
+
+  async def __aenter__(self):
+    return self
+
+  async def __aexit__(self, *args):
+    await self.aclose()
 
-  async def query(self, api: API, url: Optional[str] = None, **params):
-    if not issubclass(api, API):
-      raise TypeError("api must be `API` type")
+  @property
+  def session(self) -> aiohttp.ClientSession:
+    """The session used to send requests, created on first access.
+    Note that this must be accessed from within a running event loop"""
+    if self._session is None:
+      connector = aiohttp.TCPConnector(**self._connector_options)
+      self._session = aiohttp.ClientSession(connector=connector)
+    return self._session
+
+  async def aclose(self):
+    """|coro|
+
+    Waits for in-flight queries to finish, then closes the underlying session
+    if it is owned by the client. The client can still be used afterwards,
+    in which case a new session is created.
+    """
+    while self._inflight:
+      self._drained = asyncio.Event()
+      await self._drained.wait()
+    self._drained = None
+
+    if self._owns_session and self._session is not None:
+      session, self._session = self._session, None
+      await session.close()
+
+  async def query(self, api: API, url: Optional[str] = None, *, deadline: Optional[float] = None, **params):
+    return await self._query(api, self._build_url(api, url, params), deadline)
+
+  async def _query(self, api: API, url: str, deadline: Optional[float] = None):
+    if self._cache is not None:
+      cached, stale = self._cache.lookup(url)
+      if cached is not None:
+        if stale:
+          self._revalidate(api, url)
+        return cached.replay() if isinstance(cached, NegativeResult) else cached
+
+    query_deadline = self._deadline(deadline)
+    self._inflight += 1
+    try:
+      # A query with a deadline of its own has the timeouts of the API lowered to it and
+      # is only retried within it, so its request cannot be shared with other queries
+      if not self._coalesce or deadline is not None:
+        return await self._fetch(api, url, query_deadline)
+      return await self._coalesced_fetch(api, url)
+    finally:
+      self._landed()
+
+  def _landed(self):
+    """Marks an in-flight request as finished"""
+    self._inflight -= 1
+    if not self._inflight and self._drained is not None:
+      self._drained.set()
+
+  def _revalidate(self, api: API, url: str):
+    """Refreshes a stale result in the background, unless it is already being refreshed"""
+    if url not in self._revalidating:
+      self._inflight += 1
+      self._revalidating[url] = asyncio.ensure_future(self._refresh(api, url))
+
+  async def _refresh(self, api: API, url: str):
+    try:
+      if self._coalesce:
+        await self._coalesced_fetch(api, url)
+      else:
+        await self._fetch(api, url, self._deadline(None))
+    except Exception:
+      pass # The stale result keeps being served until it expires
+    finally:
+      del self._revalidating[url]
+      self._landed()
+
+  async def _fetch(self, api: API, url: str, deadline: Optional[_Deadline] = None):
+    try:
+      result, status = await self._request(api, url, deadline)
+    except InterpretationError as e:
+      if self._cache is not None and not self._cut_short(deadline):
+        self._cache.set(url, NegativeResult(exception=e))
+      raise
+    # Other failures are never cached, so that they are not served once the API recovers
+    if self._cache is not None and self._cacheable(status, result) and not self._cut_short(deadline, result):
+      self._store(url, result)
+    return result
 
+  async def _coalesced_fetch(self, api: API, url: str):
+    """Joins the in-flight request for `url`, starting one if there is none.
+    A started request is bound by the total timeout of the client, and is
+    cancelled once no query waits for it"""
+    key = (api, url)
+    flight = self._flights.get(key)
+    if flight is None:
+      flight = self._flights[key] = _Flight(
+        asyncio.ensure_future(self._fetch(api, url, self._deadline(None)))
+      )
 
-    if api.VERSION not in self.API_VERSION.keys():
-      raise ValueError(f"Unknown API version '{api.VERSION}'.")
+      def landed(_):
+        if self._flights.get(key) is flight:
+          del self._flights[key]
 
-    api_version = self.API_VERSION[api.VERSION]
+      flight.task.add_done_callback(landed)
 
+    flight.waiters += 1
     try:
-      params = "?" + urlencode(
-        tuple(
-          dict(appid=self.appid, **api.PARAMS, **params).items()
-        )
-      )
-    except TypeError:
-      raise ParameterConflict("cannot pass a parameter specified by `API` object")
-      
-    base_url = url if url is not None else self.BASE_URL
-    url = base_url + api_version + api.ENDPOINT + params
-    async with aiohttp.ClientSession() as client:
-      async with client.get(url) as resp:
-        result = await api.async_format_results(resp)
-    return result
+      # The request is shielded so that a cancelled caller only stops waiting for it
+      return await asyncio.shield(flight.task)
+    except asyncio.CancelledError:
+      if flight.waiters == 1:
+        flight.task.cancel()
+      raise
+    finally:
+      flight.waiters -= 1
+
+  async def _request(self, api: API, url: str, deadline: Optional[_Deadline] = None) -> Tuple[Any, int]:
+    """Sends a query, retrying it as needed, and returns its result along with the status code of its response"""
+    retry = self._retry_policy
+    attempt = 0 # Every request sent
+    tries = 1 # Only the requests counted by the retry policy
+    try:
+      while True:
+        remaining = deadline.remaining() if deadline is not None else None
+        appid = self._appids.acquire()
+        if self._rate_limiter is not None:
+          await self._rate_limiter.async_acquire(appid, remaining)
+        attempt += 1
+        try:
+          result, status, delay = await self._send(api, url, appid, tries, deadline)
+          if delay is None:
+            if self._invalidate(appid, result):
+              continue
+            if isinstance(result, FullResults):
+              self._phase_timings.record(result)
+            return set_attempts(result, attempt), status
+        except InvalidAppID:
+          # Another App ID from the pool is tried straight away
+          if not self._invalidate(appid):
+            raise
+          continue
+        except Exception as e:
+          if deadline is not None and deadline.expired and not isinstance(e, WolframException):
+            # The request most likely timed out because of the deadline
+            raise DeadlineExceeded("query did not finish before its deadline") from e
+          if retry is None or not retry.retry_exception(tries, e):
+            raise
+          delay = retry.backoff(tries)
+        if deadline is not None and delay >= deadline.remaining():
+          raise DeadlineExceeded("query cannot be retried before its deadline")
+        await asyncio.sleep(delay)
+        tries += 1
+    finally:
+      if retry is not None:
+        retry.record(attempt)
+
+  async def _attempt(
+    self,
+    api: API,
+    url: str,
+    appid: str,
+    tries: int,
+    deadline: Optional[_Deadline] = None
+  ) -> Tuple[Any, int, Optional[float]]:
+    """Sends a single request, returning either its result and status code,
+    or its status code and how long to wait before it is retried"""
+    retry = self._retry_policy
+    remaining = deadline.remaining() if deadline is not None else None
+    timeout = aiohttp.ClientTimeout(
+      total=remaining,
+      sock_connect=self._connect_timeout,
+      sock_read=self._read_timeout
+    )
+    request_url = self._request_url(api, url, appid, deadline)
+    with self._call(url, deadline) as call:
+      async with self.session.get(request_url, timeout=timeout) as resp:
+        call.status = resp.status
+        if retry is None or not retry.retry_status(tries, resp.status):
+          return await api.async_format_results(resp, self._json_loads), resp.status, None
+        return None, resp.status, retry.backoff(tries, resp.headers)
+
+  async def _hedge_slot(self, appid: str) -> bool:
+    """|coro|
+
+    Takes a slot of the rate limiter for a hedged request, returning
+    whether one was available without waiting"""
+    if self._rate_limiter is None:
+      return True
+    try:
+      await self._rate_limiter.async_acquire(appid, 0)
+    except DeadlineExceeded:
+      return False
+    return True
+
+  async def _send(
+    self,
+    api: API,
+    url: str,
+    appid: str,
+    tries: int,
+    deadline: Optional[_Deadline] = None
+  ) -> Tuple[Any, int, Optional[float]]:
+    """Sends a single request, hedging it if it is slow"""
+    hedge = self._hedge_policy
+    if hedge is None:
+      return await self._attempt(api, url, appid, tries, deadline)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    primary = asyncio.ensure_future(self._attempt(api, url, appid, tries, deadline))
+    pending = {primary}
+    try:
+      delay = hedge.delay()
+      if delay is not None:
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if not done and hedge.try_hedge():
+          if await self._hedge_slot(appid):
+            self._appids.use(appid)
+            pending.add(asyncio.ensure_future(self._attempt(api, url, appid, tries, deadline)))
+          else:
+            hedge.release()
+
+      error = None
+      while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+          if task.exception() is None:
+            hedge.record(loop.time() - start, hedge_won=task is not primary)
+            return task.result()
+          error = error or task.exception()
+      raise error
+    finally:
+      for task in pending:
+        task.cancel()
+
+  async def _batch_item(self, api: API, index: int, item, params: Dict[str, Any]) -> BatchResult:
+    try:
+      result = await self.query(api, **self._batch_params(api, item, params))
+    except Exception as e:
+      return BatchResult(index, item, exception=e)
+    else:
+      return BatchResult(index, item, result=result)
+
+  async def map(
+    self,
+    api: API,
+    inputs: Union[Iterable, AsyncIterable],
+    *,
+    max_concurrency: int = 10,
+    **params
+  ) -> AsyncIterator[Any]:
+    """
+    
+    Send a query for every item of `inputs`, yielding the results in input order.
+
+    At most `max_concurrency` queries are in flight at once, and items are only
+    pulled from `inputs` when there is room for them, so memory use stays bounded
+    regardless of how long `inputs` is. A query that fails does not stop the batch,
+    instead the exception it raised is yielded in place of its result.
+
+    Parameters
+    ----------
+    api: :class:`~wolfram.api.API`
+      The API to query.
+    inputs: Union[Iterable, AsyncIterable]
+      The items to query. A `str` is sent as the input of the API, while a
+      mapping is sent as the parameters of that query.
+    max_concurrency: `int`
+      The maximum number of queries in flight at once. Defaults to `10`.
+    \*\*params
+      Parameters shared by every query in the batch.
+    """
+    if max_concurrency < 1:
+      raise ValueError("max_concurrency must be at least 1")
+
+    items = _aiter(inputs)
+    pending = deque()
+    index = 0
+    exhausted = False
+    try:
+      while True:
+        while not exhausted and len(pending) < max_concurrency:
+          try:
+            item = await items.__anext__()
+          except StopAsyncIteration:
+            exhausted = True
+          else:
+            pending.append(
+              asyncio.ensure_future(self._batch_item(api, index, item, params))
+            )
+            index += 1
+        if not pending:
+          break
+        res = await pending.popleft()
+        yield res.result if res.ok else res.exception
+    finally:
+      for task in pending:
+        task.cancel()
+
+  async def as_completed(
+    self,
+    api: API,
+    inputs: Union[Iterable, AsyncIterable],
+    *,
+    max_concurrency: int = 10,
+    **params
+  ) -> AsyncIterator[BatchResult]:
+    """
+    
+    Send a query for every item of `inputs`, yielding each :class:`~wolfram.models.BatchResult`
+    as soon as its query finishes.
+
+    At most `max_concurrency` queries are in flight at once, and items are only
+    pulled from `inputs` when there is room for them, so memory use stays bounded
+    regardless of how long `inputs` is.
+
+    Parameters
+    ----------
+    api: :class:`~wolfram.api.API`
+      The API to query.
+    inputs: Union[Iterable, AsyncIterable]
+      The items to query. A `str` is sent as the input of the API, while a
+      mapping is sent as the parameters of that query.
+    max_concurrency: `int`
+      The maximum number of queries in flight at once. Defaults to `10`.
+    \*\*params
+      Parameters shared by every query in the batch.
+    """
+    if max_concurrency < 1:
+      raise ValueError("max_concurrency must be at least 1")
+
+    items = _aiter(inputs)
+    pending = set()
+    index = 0
+    exhausted = False
+    try:
+      while True:
+        while not exhausted and len(pending) < max_concurrency:
+          try:
+            item = await items.__anext__()
+          except StopAsyncIteration:
+            exhausted = True
+          else:
+            pending.add(
+              asyncio.ensure_future(self._batch_item(api, index, item, params))
+            )
+            index += 1
+        if not pending:
+          break
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+          yield task.result()
+    finally:
+      for task in pending:
+        task.cancel()
 
   # NOTE: Not all parameters are supported
-  # Additionally, parameters produced by timeout and async related params are not easily accessible atm
+  # Additionally, the asynchronous mode of the FullResults API is only available through `full_results_stream`
   @overload
   async def full_results_query(
     self,
@@ -480,6 +1856,12 @@ class AsyncClient(ClientBase):
     ignorecase: Optional[Bool] = None,
     assumption: Optional[str] = None,
     units: Optional[Units] = None,
+    scantimeout: Optional[float] = None,
+    podtimeout: Optional[float] = None,
+    formattimeout: Optional[float] = None,
+    parsetimeout: Optional[float] = None,
+    totaltimeout: Optional[float] = None,
+    latency_budget: Optional[float] = None,
     **params
   ) -> FullResults:
     ...
@@ -497,6 +1879,12 @@ class AsyncClient(ClientBase):
     ignorecase: Optional[Bool] = None,
     assumption: Optional[str] = None,
     units: Optional[Units] = None,
+    scantimeout: Optional[float] = None,
+    podtimeout: Optional[float] = None,
+    formattimeout: Optional[float] = None,
+    parsetimeout: Optional[float] = None,
+    totaltimeout: Optional[float] = None,
+    latency_budget: Optional[float] = None,
     **params
   ) -> FullResults:
     ...
@@ -514,6 +1902,12 @@ class AsyncClient(ClientBase):
     ignorecase: Optional[Bool] = None,
     assumption: Optional[str] = None,
     units: Optional[Units] = None,
+    scantimeout: Optional[float] = None,
+    podtimeout: Optional[float] = None,
+    formattimeout: Optional[float] = None,
+    parsetimeout: Optional[float] = None,
+    totaltimeout: Optional[float] = None,
+    latency_budget: Optional[float] = None,
     **params
   ) -> FullResults:
     ...
@@ -531,6 +1925,12 @@ class AsyncClient(ClientBase):
     ignorecase: Optional[Bool] = None,
     assumption: Optional[str] = None,
     units: Optional[Units] = None,
+    scantimeout: Optional[float] = None,
+    podtimeout: Optional[float] = None,
+    formattimeout: Optional[float] = None,
+    parsetimeout: Optional[float] = None,
+    totaltimeout: Optional[float] = None,
+    latency_budget: Optional[float] = None,
     **params
   ) -> FullResults:
     ...
@@ -569,23 +1969,205 @@ class AsyncClient(ClientBase):
       Specifies an assumption, such as the meaning of a word or the value of a formula variable.
     units: Optional[:class:`~wolfram.Units`]
       Lets you specify the preferred measurement system, either "metric" or "imperial" (US customary units).
+    scantimeout: Optional[`float`]
+      The number of seconds to allow Wolfram|Alpha to compute results in the "scan" stage of processing.
+    podtimeout: Optional[`float`]
+      The number of seconds to allow Wolfram|Alpha to spend in the "format" stage for any one pod.
+    formattimeout: Optional[`float`]
+      The number of seconds to allow Wolfram|Alpha to spend in the "format" stage for the entire collection of pods.
+    parsetimeout: Optional[`float`]
+      The number of seconds to allow Wolfram|Alpha to spend in the "parsing" stage of processing.
+    totaltimeout: Optional[`float`]
+      The total number of seconds to allow Wolfram|Alpha to spend on a query.
+    latency_budget: Optional[`float`]
+      The number of seconds Wolfram|Alpha should spend on the query, split among the
+      timeouts above using the timings of past results. Timeouts passed in explicitly are kept.
+      Pods that were cut off are reported by :attr:`~wolfram.models.FullResults.timedout_pods`.
     \*\*params
       A keyword argument list of other parameters to be passed to the API.
       All parameters can be found at https://products.wolframalpha.com/api/documentation?scrollTo=parameter-reference.
     """
 
-    # For some reason unlike the other APIs the FullResults API units parameter is metric or nonmetric
-    # instead of imperial, so we'll just do a replace if it is imperial
-    units = params.get("units", None)
-    if units is not None and units == Units.IMPERIAL:
-      params["units"] == "nonmetric"
+    return await self.query(api=FullResultsAPI, input=input, **self._full_results_params(params))
 
-    format = params.pop("format", None)
+  async def full_results_pods(
+    self,
+    input: str,
+    pod_ids: Sequence[str],
+    *,
+    url: Optional[str] = None,
+    deadline: Optional[float] = None,
+    **params
+  ) -> FullResults:
+    """
+    
+    Send a query to the Wolfram|Alpha FullResults API for only the given pods.
 
-    if format is not None:
-      return await self.query(api=FullResultsAPI, input=input, format=",".join(format), **params)
-    else:
-      return await self.query(api=FullResultsAPI, input=input, **params)
+    Only the requested pods are computed and sent by the API, which is faster than a full query.
+    With a cache, the result of every pod is cached separately, so that later queries
+    only fetch the pods that are not cached yet. The pods are merged into a single result,
+    in position order.
+
+    Parameters
+    ----------
+    input: `str`
+      The input string to be interpreted.
+    pod_ids: Sequence[`str`]
+      The IDs of the pods to return, such as `"Result"`.
+    url: Optional[`str`]
+      The host url to send the query to. Defaults to the Wolfram|Alpha API.
+    deadline: Optional[`float`]
+      The number of seconds the query has to finish in.
+    \*\*params
+      A keyword argument list of other parameters to be passed to the API,
+      the same as :meth:`full_results_query`.
+
+    Raises
+    ------
+    ~wolfram.InterpretationError
+      Input was unable to be interpreted by the API.
+    ~wolfram.ParameterConflict
+      The `includepodid` parameter was passed in.
+    """
+    params = self._full_results_params(params)
+    pod_urls = self._pod_urls(url, input, pod_ids, params)
+    found, missing = self._cached_pods(pod_urls)
+    if missing:
+      query_url = self._build_url(FullResultsAPI, url, {"input": input, "includepodid": missing, **params})
+      query_deadline = self._deadline(deadline)
+      self._inflight += 1
+      try:
+        result, status = await self._request(FullResultsAPI, query_url, query_deadline)
+      except InterpretationError as e:
+        if self._cache is not None and not self._cut_short(query_deadline):
+          for pod_id in missing:
+            self._cache.set(pod_urls[pod_id], NegativeResult(exception=e))
+        raise
+      finally:
+        self._landed()
+      if (
+        self._cache is None
+        or not self._cacheable(status, result)
+        or self._cut_short(query_deadline, result)
+      ):
+        return result
+      found.update(self._split_pods(result, pod_urls, missing))
+    return self._merge_pods([found[pod_id] for pod_id in pod_ids])
+
+  async def full_results_stream(
+    self,
+    input: str,
+    *,
+    async_timeout: Optional[float] = None,
+    url: Optional[str] = None,
+    deadline: Optional[float] = None,
+    **params
+  ) -> AsyncIterator[FullResults]:
+    """
+    
+    Send an asynchronous query to the Wolfram|Alpha FullResults API, yielding the result as pods arrive.
+
+    Pods that are slow to compute are deferred by the API, and fetched concurrently.
+    The result is yielded as soon as the other pods arrive, then again every time a deferred pod
+    has been fetched and merged into :attr:`~wolfram.models.FullResults.pods`, in position order.
+    Deferred pods that fail to be fetched are left as they are. Streamed results are not cached.
+
+    Parameters
+    ----------
+    input: `str`
+      The input string to be interpreted.
+    async_timeout: Optional[`float`]
+      How long the API works on pods before deferring them, in seconds.
+      Defaults to the API's own timeout.
+    url: Optional[`str`]
+      The host url to send the query to. Defaults to the Wolfram|Alpha API.
+    deadline: Optional[`float`]
+      The number of seconds the query, including deferred pods, has to finish in.
+    \*\*params
+      A keyword argument list of other parameters to be passed to the API,
+      the same as :meth:`full_results_query`.
+    """
+    params = self._full_results_params(params)
+    params["async"] = "true" if async_timeout is None else async_timeout
+
+    query_deadline = self._deadline(deadline)
+    query_url = self._build_url(FullResultsAPI, url, {"input": input, **params})
+    self._inflight += 1
+    try:
+      result, _ = await self._request(FullResultsAPI, query_url, query_deadline)
+    finally:
+      self._landed()
+    yield result
+
+    # Only the requests themselves are in flight, not the stream while it is paused
+    # at a yield, so that the client can be closed by its consumer
+    pending = set()
+    for pod in result.deferred:
+      self._inflight += 1
+      task = asyncio.ensure_future(self._fetch_pod(pod.deferred_url, query_deadline))
+      task.add_done_callback(lambda _: self._landed())
+      pending.add(task)
+    try:
+      while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+          if task.exception() is None:
+            result.merge_pod(task.result())
+            yield result
+    finally:
+      for task in pending:
+        task.cancel()
+
+  def follow_recalculate(self, result: FullResults, *, deadline: Optional[float] = None) -> asyncio.Future:
+    """Follows the :attr:`~wolfram.models.FullResults.recalculate` url of a result in the background,
+    for the pods that timed out during the first pass of the query.
+    Note that this must be called from within a running event loop.
+
+    The late pods are merged into `result` itself, in position order. The returned future
+    resolves to `result` once they are merged, straight away if there is nothing to recalculate.
+
+    Parameters
+    ----------
+    result: :class:`~wolfram.models.FullResults`
+      The first-pass result of a query.
+    deadline: Optional[`float`]
+      The number of seconds the recalculation has to finish in.
+    """
+    if not result.recalculate:
+      future = asyncio.get_running_loop().create_future()
+      future.set_result(result)
+      return future
+    self._inflight += 1
+    task = asyncio.ensure_future(self._recalculate(result, self._deadline(deadline)))
+    task.add_done_callback(lambda _: self._landed())
+    return task
+
+  async def _recalculate(self, result: FullResults, deadline: Optional[_Deadline] = None) -> FullResults:
+    remaining = deadline.remaining() if deadline is not None else None
+    timeout = aiohttp.ClientTimeout(
+      total=remaining,
+      sock_connect=self._connect_timeout,
+      sock_read=self._read_timeout
+    )
+    try:
+      async with self.session.get(result.recalculate.url, timeout=timeout) as resp:
+        result.merge_recalculated(await FullResultsAPI.async_format_results(resp, self._json_loads))
+    except Exception as e:
+      if deadline is not None and deadline.expired:
+        raise DeadlineExceeded("recalculation did not finish before its deadline") from e
+      raise
+    return result
+
+  async def _fetch_pod(self, url: str, deadline: Optional[_Deadline] = None) -> Pod:
+    """Fetches the contents of a deferred pod"""
+    remaining = deadline.remaining() if deadline is not None else None
+    timeout = aiohttp.ClientTimeout(
+      total=remaining,
+      sock_connect=self._connect_timeout,
+      sock_read=self._read_timeout
+    )
+    async with self.session.get(url, timeout=timeout) as resp:
+      return await FullResultsAPI.async_format_pod(resp, self._json_loads)
 
   @overload
   async def conversational_query(
@@ -839,3 +2421,121 @@ class AsyncClient(ClientBase):
       The app ID supplied to the client is invalid.
     """
     return await self.query(api=SpokenAPI, i=i, **params)
+
+
+
+class PreparedQuery:
+  """A query with fixed parameters, created by :meth:`Client.prepare` or :meth:`AsyncClient.prepare`
+
+  Calling it with an input sends the query, and returns the result for a :class:`Client`,
+  or an awaitable of the result for an :class:`AsyncClient`.
+  """
+  __slots__ = ("_client", "_api", "_prefix", "_suffix")
+
+  def __init__(self, client: ClientBase, api: API, prefix: str, suffix: str):
+    self._client = client
+    self._api = api
+    self._prefix = prefix
+    self._suffix = suffix
+
+  def __repr__(self):
+    return f"PreparedQuery(api={self._api.__name__}, url={self.url('')})"
+
+  def __call__(self, input: str, *, deadline: Optional[float] = None):
+    return self._client._query(self._api, self.url(input), deadline)
+
+  @property
+  def api(self) -> API:
+    """The API the query is sent to"""
+    return self._api
+
+  def url(self, input: str) -> str:
+    """Returns the canonical url of the query for the given input"""
+    return self._prefix + quote_plus(str(input)) + self._suffix
+
+
+
+class _Deadline:
+  """The point in time a query has to finish by"""
+  __slots__ = ("expires", "lowered")
+
+  def __init__(self, timeout: float):
+    self.expires = time.monotonic() + timeout
+    # Set once a request of the query is sent with the timeouts of the API lowered
+    self.lowered = False
+
+  @property
+  def expired(self) -> bool:
+    return time.monotonic() >= self.expires
+
+  def remaining(self) -> float:
+    """Returns the number of seconds left before the deadline
+
+    Raises
+    ------
+    ~wolfram.exceptions.DeadlineExceeded
+      The deadline has already passed.
+    """
+    remaining = self.expires - time.monotonic()
+    if remaining <= 0:
+      raise DeadlineExceeded("query did not finish before its deadline")
+    return remaining
+
+
+
+def _bound(timeout: Optional[float], remaining: Optional[float]) -> Optional[float]:
+  """Bounds a timeout by the time left before a deadline"""
+  if remaining is None:
+    return timeout
+  return remaining if timeout is None else min(timeout, remaining)
+
+
+
+def _spawn(fn: Callable, *args) -> Future:
+  """Calls a function in a new thread, returning a future of its result"""
+  future = Future()
+
+  def run():
+    if future.set_running_or_notify_cancel():
+      try:
+        future.set_result(fn(*args))
+      except BaseException as e:
+        future.set_exception(e)
+
+  threading.Thread(target=run, name="wolfram-request", daemon=True).start()
+  return future
+
+
+
+class _Call:
+  """A single request guarded by a circuit breaker"""
+  __slots__ = ("status",)
+
+  def __init__(self):
+    self.status: Optional[int] = None
+
+  @property
+  def ok(self) -> bool:
+    """Whether a response without a server error was received"""
+    return self.status is not None and self.status < 500
+
+
+
+class _Flight:
+  """A request shared by every concurrent query for the same url"""
+  __slots__ = ("task", "waiters")
+
+  def __init__(self, task: asyncio.Task):
+    self.task = task
+    self.waiters = 0
+
+
+
+async def _aiter(iterable: Union[Iterable, AsyncIterable]) -> AsyncIterator:
+  """Iterates over either a regular or an asynchronous iterable"""
+  if isinstance(iterable, AsyncIterable):
+    async for item in iterable:
+      yield item
+  else:
+    for item in iterable:
+      yield item
@@ -0,0 +1,57 @@
+"""
+JSON backends used to decode responses
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict, Optional
+
+JSONLoads = Callable[[bytes], Any]
+
+
+def _orjson() -> JSONLoads:
+  import orjson
+  return orjson.loads
+
+def _msgspec() -> JSONLoads:
+  import msgspec
+  return msgspec.json.decode
+
+def _json() -> JSONLoads:
+  return json.loads
+
+# In order of preference, the standard library always being available
+BACKENDS: Dict[str, Callable[[], JSONLoads]] = {
+  "orjson": _orjson,
+  "msgspec": _msgspec,
+  "json": _json
+}
+
+
+def get_loads(backend: Optional[str] = None) -> JSONLoads:
+  """Returns the function decoding JSON from bytes of a backend,
+  or of the fastest backend installed if none is given
+
+  Parameters
+  ----------
+  backend: Optional[`str`]
+    One of `"orjson"`, `"msgspec"` or `"json"`.
+
+  Raises
+  ------
+  ImportError
+    The backend is not installed.
+  """
+  if backend is not None:
+    if backend not in BACKENDS:
+      raise ValueError(f"Unknown JSON backend '{backend}'.")
+    return BACKENDS[backend]()
+  for load in BACKENDS.values():
+    try:
+      return load()
+    except ImportError:
+      pass
+
+
+# The function responses are decoded with by default
+loads = get_loads()
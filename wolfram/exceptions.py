@@ -11,4 +11,13 @@ class MissingParameters(WolframException):
   """Exception that is raised when a required parameter is missing. This should rarely be raised"""
 
 class InvalidAppID(WolframException):
-  """Exception that is raised when an App ID is invalid"""
\ No newline at end of file
+  """Exception that is raised when an App ID is invalid"""
+
+class QuotaExceeded(WolframException):
+  """Exception that is raised when every App ID of a pool has used up its quota"""
+
+class CircuitOpen(WolframException):
+  """Exception that is raised when a circuit breaker is open, so the request is not sent"""
+
+class DeadlineExceeded(WolframException):
+  """Exception that is raised when a query could not finish before its deadline"""
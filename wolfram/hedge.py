@@ -0,0 +1,120 @@
+"""
+Hedging policies used to cut the tail latency of requests
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+
+@dataclass
+class HedgeStats:
+  """Counters collected by a hedging policy"""
+  requests: int = 0
+  hedged: int = 0
+  wins: int = 0
+
+  @property
+  def hedge_rate(self) -> float:
+    """The fraction of requests that were hedged"""
+    return self.hedged / self.requests if self.requests else 0.0
+
+
+
+class HedgePolicy:
+  """Describes when a slow request is hedged with a second, identical request
+
+  If no response has arrived after the hedging delay, a second request is sent
+  and whichever finishes first is used, the other one being cancelled.
+  The delay is either fixed, or the given percentile of the latencies observed so far.
+
+  Parameters
+  ----------
+  delay: Optional[`float`]
+    A fixed delay after which a request is hedged, in seconds.
+    If not given, the delay is based on observed latencies.
+  percentile: `float`
+    The percentile of observed latencies used as the delay, between `0` and `100`.
+    Defaults to `95`.
+  budget: `float`
+    The maximum fraction of requests that can be hedged. Defaults to `0.05`.
+  window: `int`
+    The number of recent latencies the percentile is computed from. Defaults to `1000`.
+  min_samples: `int`
+    The number of latencies to observe before hedging based on them. Defaults to `20`.
+  """
+
+  def __init__(
+    self,
+    delay: Optional[float] = None,
+    *,
+    percentile: float = 95,
+    budget: float = 0.05,
+    window: int = 1000,
+    min_samples: int = 20
+  ):
+    if not 0 < percentile <= 100:
+      raise ValueError("percentile must be between 0 and 100")
+    if not 0 <= budget <= 1:
+      raise ValueError("budget must be between 0 and 1")
+    self._delay = delay
+    self._percentile = percentile
+    self._budget = budget
+    self._min_samples = min_samples
+    self._latencies: Deque[float] = deque(maxlen=window)
+    self._threshold: Optional[float] = None
+    self._since_threshold = 0
+    self._stats = HedgeStats()
+    self._lock = threading.Lock()
+
+  def __repr__(self):
+    if self._delay is not None:
+      return f"HedgePolicy(delay={self._delay}, budget={self._budget})"
+    return f"HedgePolicy(percentile={self._percentile}, budget={self._budget})"
+
+  @property
+  def stats(self) -> HedgeStats:
+    """A snapshot of the counters of the policy"""
+    with self._lock:
+      return HedgeStats(**vars(self._stats))
+
+  def delay(self) -> Optional[float]:
+    """Returns how long to wait for a response before hedging a new request,
+    or `None` if not enough latencies have been observed yet"""
+    with self._lock:
+      self._stats.requests += 1
+      if self._delay is not None:
+        return self._delay
+      if len(self._latencies) < self._min_samples:
+        return None
+      # Sorting the window on every request is wasteful, so the threshold is
+      # only recomputed once enough new latencies have been observed
+      if self._threshold is None or self._since_threshold >= self._min_samples:
+        latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * self._percentile / 100))
+        self._threshold = latencies[index]
+        self._since_threshold = 0
+      return self._threshold
+
+  def try_hedge(self) -> bool:
+    """Takes a hedge from the budget, returning whether the request can be hedged"""
+    with self._lock:
+      if self._stats.hedged + 1 > self._budget * self._stats.requests:
+        return False
+      self._stats.hedged += 1
+      return True
+
+  def release(self):
+    """Gives back a hedge taken with :meth:`try_hedge` that was not sent"""
+    with self._lock:
+      self._stats.hedged -= 1
+
+  def record(self, latency: float, hedge_won: bool = False):
+    """Records the latency of a finished request, in seconds"""
+    with self._lock:
+      self._latencies.append(latency)
+      self._since_threshold += 1
+      if hedge_won:
+        self._stats.wins += 1
@@ -4,9 +4,13 @@ data classes are here
 """
 from __future__ import annotations
 
-from dataclasses import dataclass, field, InitVar
+from bisect import bisect_right
+from dataclasses import MISSING, dataclass, field, fields, InitVar
 from typing import (
+  Any,
   Callable,
+  Dict,
+  FrozenSet,
   Generic,
   Mapping,
   Optional,
@@ -51,6 +55,8 @@ DictT = TypeVar("DictT", bound=WolframDict)
 
 
 class WolframURL:
+  __slots__ = ("_path", "_query")
+
   def __init__(self, url: str):
     url = url.split("?")
     if len(url) > 1:
@@ -105,60 +111,216 @@ def optional_field(factory: Callable, match=None, **kwargs) -> Field:
     **kwargs
   )
 
+def slotted(cls: type) -> type:
+  """Recreates a dataclass with `__slots__` for the fields it declares,
+  as `dataclass(slots=True)` does on Python 3.10 and above"""
+  inherited = set()
+  for base in cls.__mro__[1:]:
+    inherited.update(getattr(base, "__slots__", ()))
+  names = tuple(f.name for f in fields(cls) if f.name not in inherited)
+
+  cls_dict = dict(cls.__dict__)
+  cls_dict["__slots__"] = names
+  # Defaults live in the generated __init__, and would clash with the slots
+  for name in names:
+    cls_dict.pop(name, None)
+  cls_dict.pop("__dict__", None)
+  cls_dict.pop("__weakref__", None)
+  new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+  new_cls.__qualname__ = cls.__qualname__
+  return new_cls
+
+def _to_raw(val: Any) -> Any:
+  """Converts a decoded value back into the form it has in a raw dictionary"""
+  if isinstance(val, Model):
+    return val.raw
+  elif isinstance(val, list):
+    return [_to_raw(v) for v in val]
+  elif isinstance(val, WolframURL):
+    return val.url
+  return val
+
+def _required(cls: type, name: str):
+  raise TypeError(f"{cls.__name__} is missing the required field '{name}'")
+
+def _make_decoder(cls: type, lazy: bool) -> Callable[[DictT], Model]:
+  """Generates a function decoding a raw dictionary into `cls`, leaving out the
+  fields built by a factory if `lazy` is set
+
+  Like the __init__ generated by dataclasses, the function is specialised to the fields
+  of the class, instead of going through the fields and their metadata for every instance.
+  It does not call __init__ nor __post_init__.
+  """
+  env = {"cls": cls, "_required": _required, "_names": frozenset(cls.__dataclass_fields__)}
+  lines = [
+    "def decode(raw):",
+    "  self = cls.__new__(cls)",
+    "  self._raw = raw",
+    "  self._extra = None"
+  ]
+  for f in fields(cls):
+    factory = f.metadata.get("factory")
+    if factory is not None and lazy:
+      continue
+    if f.default is not MISSING:
+      env[f"_dflt_{f.name}"] = f.default
+      val = f"raw.get({f.name!r}, _dflt_{f.name})"
+    elif f.default_factory is not MISSING:
+      env[f"_dflt_{f.name}"] = f.default_factory
+      val = f"raw[{f.name!r}] if {f.name!r} in raw else _dflt_{f.name}()"
+    else:
+      val = f"raw[{f.name!r}] if {f.name!r} in raw else _required(cls, {f.name!r})"
+    if factory is not None:
+      env[f"_factory_{f.name}"] = factory
+      val = f"_factory_{f.name}({val})"
+    lines.append(f"  self.{f.name} = {val}")
+  if not lazy:
+    lines += [
+      "  if not cls.keep_raw:",
+      "    self._raw = None",
+      "    self._extra = {k: v for k, v in raw.items() if k not in _names} or None"
+    ]
+  lines.append("  return self")
+  exec("\n".join(lines), env)
+  return env["decode"]
+
 @dataclass
 class Model(Generic[DictT]):
-  """The base class of all Wolfram|Alpha models"""
+  """The base class of all Wolfram|Alpha models
+
+  Models built with :meth:`from_dict` are decoded lazily when :attr:`lazy` is set,
+  either on a single model class or on :class:`Model` itself for every model.
+  Fields built by a factory, such as the pods of a result, are then only decoded
+  from the raw dictionary the first time they are accessed, and kept from then on.
+
+  Models keep the raw dictionary they were built from unless :attr:`keep_raw` is unset,
+  in which case they only keep the keys that are not fields, and :attr:`raw` is rebuilt
+  from the fields when needed. Such models are always decoded up front.
+  """
+  __slots__ = ("_raw", "_extra", "_attempts")
+
   _raw: InitVar[DictT]
 
+  # If fields built by a factory are decoded on first access rather than up front
+  lazy = False
+
+  # If the raw dictionary is kept once the fields have been decoded from it
+  keep_raw = True
+
   def __post_init__(self, _raw: DictT=None):
     self._raw = _raw
+    self._extra = None
     for attr, field in self.__dataclass_fields__.items():
       # This is a little hacky, but no better way to do this with dataclasses
       factory = field.metadata.get("factory")
       if factory is not None:
         val = getattr(self, attr)
         setattr(self, attr, factory(val))
+    if _raw is not None and not self.keep_raw:
+      self._raw = None
+      self._extra = {
+        k: v
+        for k, v in _raw.items()
+        if k not in self.__dataclass_fields__
+      } or None
 
   def __getattr__(self, attr):
-    return self.raw[attr]
+    # Only reached when the attribute is missing from the instance, which is
+    # the case of the fields of a lazily decoded model that were never accessed
+    if attr.startswith("_"):
+      raise AttributeError(attr)
+    field = type(self)._lazy_fields().get(attr)
+    if field is None:
+      return self[attr]
+    val = self._raw.get(attr, MISSING)
+    if val is MISSING:
+      val = field.default_factory() if field.default is MISSING else field.default
+    # Decoding twice from separate threads only wastes work, as the results are equal
+    val = field.metadata["factory"](val)
+    setattr(self, attr, val)
+    return val
 
   def __getitem__(self, item):
-    return self.raw[item]
+    val = self.get(item, MISSING)
+    if val is MISSING:
+      raise KeyError(item)
+    return val
+
+  def get(self, key: str, default: Any = None) -> Any:
+    """Returns the value of a key of the raw dictionary, or `default` if it is missing.
+    Unlike :attr:`raw`, the raw dictionary is not rebuilt if it was not kept"""
+    if self._raw is not None:
+      return self._raw.get(key, default)
+    elif key in self.__dataclass_fields__:
+      return _to_raw(getattr(self, key))
+    return (self._extra or {}).get(key, default)
+
+  @classmethod
+  def _lazy_fields(cls) -> Dict[str, Field]:
+    """Returns the fields built by a factory, by name, computed once per class"""
+    lazy_fields = cls.__dict__.get("_lazy_fields_cache")
+    if lazy_fields is None:
+      lazy_fields = cls._lazy_fields_cache = {
+        f.name: f for f in fields(cls)
+        if f.metadata.get("factory") is not None
+      }
+    return lazy_fields
+
+  @classmethod
+  def _decoder(cls, lazy: bool = False) -> Callable[[DictT], Model]:
+    """Returns the function decoding a raw dictionary into the class, generated once per class"""
+    decoders = cls.__dict__.get("_decoders")
+    if decoders is None:
+      decoders = cls._decoders = {}
+    decoder = decoders.get(lazy)
+    if decoder is None:
+      decoder = decoders[lazy] = _make_decoder(cls, lazy)
+    return decoder
 
   @classmethod
   def from_dict(cls, raw: DictT):
     """Constructs the model from a mapping"""
-    return cls(
-      _raw = raw,
-      **{
-        k: v
-        for k, v in raw.items()
-        if k in cls.__dataclass_fields__.keys()
-      }
-    )
+    return cls._decoder(cls.lazy and cls.keep_raw)(raw)
+
+  @property
+  def attempts(self) -> int:
+    """The number of attempts it took to receive the model, set by the client"""
+    return getattr(self, "_attempts", 1)
+
+  @attempts.setter
+  def attempts(self, attempts: int):
+    self._attempts = attempts
 
   @property
   def _to_dict(self) -> DictT:
     """Returns the model with it's values in a dictionary excluding private variables,
     not to be called directly"""
-    d = {}
-    for k in self.__dataclass_fields__.keys():
-      if not k.startswith("_"):
-        if isinstance(k, Model):
-          d[k] = getattr(self, k).raw
-        else:
-          d[k] = getattr(self, k)
+    d = dict(self._extra or {})
+    for f in fields(self):
+      if not f.name.startswith("_"):
+        d[f.name] = _to_raw(getattr(self, f.name))
     return d
 
   @property
   def raw(self) -> DictT:
-    """Returns the raw dictionary of the model"""
+    """Returns the raw dictionary of the model, rebuilt from
+    its fields if it was not kept"""
     return self._raw if self._raw is not None else self._to_dict
 
+  def _update_raw(self, **items):
+    """Updates keys of the raw dictionary, or only the keys that are not fields if it was not kept"""
+    if self._raw is not None:
+      self._raw.update(items)
+      return
+    extra = {k: v for k, v in items.items() if k not in self.__dataclass_fields__}
+    if extra:
+      self._extra = {**(self._extra or {}), **extra}
+
 
 
 # Subpod models
 
+@slotted
 @dataclass
 class Image(Model[ImageDict]):
   width: int
@@ -168,8 +330,9 @@ class Image(Model[ImageDict]):
     factory=WolframURL
   )
   themes: List[int] = model_field(
+    # Themes are a comma separated string, or a list when rebuilt from the fields
     factory=lambda seq: [
-      int(ele) for ele in seq.split(",")
+      int(ele) for ele in (seq.split(",") if isinstance(seq, str) else seq)
     ]
   )
   title: Optional[str] = optional_field(
@@ -185,6 +348,7 @@ class Image(Model[ImageDict]):
     return f"Image(title={self.title}, alt={self.alt}, src={self.src})"
 
 
+@slotted
 @dataclass
 class Audio(Model[AudioDict]):
   type: str
@@ -194,6 +358,7 @@ class Audio(Model[AudioDict]):
 
 # Assumptions
 
+@slotted
 @dataclass
 class Assumption(Model[AssumptionDict]):
   name: str
@@ -203,6 +368,7 @@ class Assumption(Model[AssumptionDict]):
   def __repr__(self):
     return f"Assumption(name={self.name})"
   
+@slotted
 @dataclass
 class AssumptionsCollection(Model[AssumptionsDict]):
   type: str
@@ -243,19 +409,78 @@ class AssumptionsCollection(Model[AssumptionsDict]):
 
 # Warnings
 
+class _WarningDispatch:
+  """Finds the subclass of a warning matching the keys of a raw warning,
+  remembering the subclass found for every set of keys
+
+  Subclasses are told apart by the fields they add to the base class. Of the subclasses
+  whose required fields are all in the raw warning, the one sharing the most added fields
+  with it is picked. A warning matching none of them, such as one with only a `text`
+  or one missing a required field, stays a base warning.
+  """
+  __slots__ = ("base", "subclasses", "signatures", "table")
+
+  def __init__(self, base: type, subclasses: List[type]):
+    self.base = base
+    self.subclasses = subclasses
+    # The original class of a subclass recreated by slotted() lingers until it is
+    # garbage collected, and is superseded by the class of the same name defined after it
+    latest = {(sub.__module__, sub.__qualname__): sub for sub in subclasses}
+    inherited = {f.name for f in fields(base)}
+    # Subclasses that add no fields, such as DelimiterWarning, cannot be told apart
+    # from the base class and are never picked
+    self.signatures = [
+      (added, required, sub)
+      for added, required, sub in (
+        (
+          frozenset(f.name for f in fields(sub)) - inherited,
+          frozenset(
+            f.name for f in fields(sub)
+            if f.default is MISSING and f.default_factory is MISSING
+          ),
+          sub
+        )
+        for sub in latest.values()
+      )
+      if added
+    ]
+    self.table: Dict[FrozenSet[str], type] = {}
+
+  def find(self, warning: DictT) -> type:
+    keys = frozenset(warning)
+    sub = self.table.get(keys)
+    if sub is None:
+      # Ties are broken by the order subclasses were defined in
+      shared, sub = max(
+        (
+          (len(added & keys), sub)
+          for added, required, sub in self.signatures
+          if required <= keys
+        ),
+        key=lambda match: match[0],
+        default=(0, self.base)
+      )
+      if not shared:
+        sub = self.base
+      self.table[keys] = sub
+    return sub
+
+
+
+@slotted
 @dataclass
 class Warning(Model[WarningDict], Generic[DictT]):
   text: str
 
   @classmethod
   def _find_cls(cls, warning: DictT):
-    for sub in cls.__subclasses__():
-      if all(
-        k in warning.keys() or k == "text"
-        for k in sub.__dataclass_fields__.keys()
-      ):
-        return sub
-    return cls
+    subclasses = cls.__subclasses__()
+    table = cls.__dict__.get("_dispatch")
+    # The table is rebuilt whenever subclasses are defined or garbage collected,
+    # such as the originals of the subclasses recreated by slotted()
+    if table is None or table.subclasses != subclasses:
+      table = cls._dispatch = _WarningDispatch(cls, subclasses)
+    return table.find(warning)
 
   @classmethod
   def to_subclass(cls, warning: DictT):
@@ -267,33 +492,38 @@ class Warning(Model[WarningDict], Generic[DictT]):
     """The warning message provided by Wolfram|Alpha"""
     return self.text
 
+@slotted
 @dataclass
 class SpellCheckWarning(Warning[SpellCheckWarningDict]):
   word: str
   suggestion: str
 
+@slotted
 @dataclass
 class DelimiterWarning(Warning[DelimiterWarningDict]):
   pass
 
+@slotted
 @dataclass
 class TranslationWarning(Warning[TranslationWarningDict]):
   phrase: str
   trans: str
   lang: str
 
+@slotted
 @dataclass
 class Alternative(Model[AlternativeDict]):
   level: str
   val: str
   score: float = model_field(factory=float)
 
+@slotted
 @dataclass
 class ReinterpretWarning(Warning[ReinterpretWarningDict]):
   new: str
   level: str
   score: float = model_field(factory=float)
-  alternative: List[Alternative] = model_field(
+  alternative: Optional[List[Alternative]] = optional_field(
     factory=always_list_factory(
       Alternative.from_dict
     )
@@ -307,12 +537,14 @@ class ReinterpretWarning(Warning[ReinterpretWarningDict]):
 
 # Queries that are not understood
 
+@slotted
 @dataclass
 class DidYouMean(Model[DidYouMeanDict]):
   level: str
   val: str
   score: float = model_field(factory=float)
 
+@slotted
 @dataclass
 class LanguageMsg(Model[LanguageMsgDict]):
   english: str
@@ -322,20 +554,24 @@ class LanguageMsg(Model[LanguageMsgDict]):
   def msg(self):
     return f"{self.english}\n{self.other}"
 
+@slotted
 @dataclass
 class FutureTopic(Model[FutureTopicDict]):
   topic: str
   msg: str
 
+@slotted
 @dataclass
 class ExamplePage(Model[ExamplePageDict]):
   category: str
   url: WolframURL = model_field(factory=WolframURL)
 
+@slotted
 @dataclass
 class Tip(Model[TipsDict]):
   text: str
 
+@slotted
 @dataclass
 class Generalization(Model[GeneralizationDict]):
   topic: str
@@ -346,6 +582,7 @@ class Generalization(Model[GeneralizationDict]):
 
 # Errors usually caused by bad app ids
 
+@slotted
 @dataclass
 class Error(Model[ErrorDict]):
   msg: str
@@ -355,6 +592,7 @@ class Error(Model[ErrorDict]):
 
 # Sources
 
+@slotted
 @dataclass
 class Source(Model[SourceDict]):
   text: str
@@ -362,6 +600,7 @@ class Source(Model[SourceDict]):
 
 
 
+@slotted
 @dataclass
 class SubPod(Model[SubPodDict]):
   title: str
@@ -378,16 +617,19 @@ class SubPod(Model[SubPodDict]):
 
 
 
+@slotted
 @dataclass
 class Pod(Model[PodDict]):
   title: str
   position: int
   id: str
   numsubpods: int
+  # Deferred pods of asynchronous queries have no subpods until they are fetched
   subpods: List[SubPod] = model_field(
     factory=list_map_factory(
       SubPod.from_dict
-    )
+    ),
+    default_factory=list
   )
   error: Optional[Error] = optional_field(
     factory=Error.from_dict,
@@ -398,6 +640,16 @@ class Pod(Model[PodDict]):
   def __repr__(self):
     return f"Pod(title={self.title}, numsubpods={self.numsubpods}, primary={self.primary})"
 
+  @property
+  def deferred_url(self) -> Optional[str]:
+    """The url the contents of the pod are fetched from, if they were deferred by an asynchronous query"""
+    return self.get("async")
+
+  @property
+  def is_deferred(self) -> bool:
+    """If the contents of the pod were deferred by an asynchronous query"""
+    return self.deferred_url is not None
+
   @property
   def text(self) -> Optional[str]:
     for subpod in self.subpods:
@@ -405,6 +657,7 @@ class Pod(Model[PodDict]):
         return subpod.plaintext
 
 
+@slotted
 @dataclass
 class FullResults(Model[FullResultsDict]):
   success: bool
@@ -498,6 +751,53 @@ class FullResults(Model[FullResultsDict]):
       if pod.text is not None
     }
 
+  @property
+  def timedout_scanners(self) -> List[str]:
+    """The scanners that timed out, whose pods are missing from the result"""
+    return [name for name in self.get("timedout", "").split(",") if name]
+
+  @property
+  def timedout_pods(self) -> List[str]:
+    """The titles of the pods that timed out, which are missing from the result"""
+    return [title for title in self.get("timedoutpods", "").split(",") if title]
+
+  @property
+  def is_complete(self) -> bool:
+    """If no scanner or pod timed out while computing the result"""
+    return not self.timedout_scanners and not self.timedout_pods
+
+  @property
+  def deferred(self) -> List[Pod]:
+    """The pods whose contents were deferred by an asynchronous query"""
+    return [pod for pod in self.pods or [] if pod.is_deferred]
+
+  def merge_pod(self, pod: Pod):
+    """Merges a pod into the result, replacing the pod with the same ID if any
+    (such as the deferred pod it was fetched for), and keeping pods in position order"""
+    # The pods are swapped for a new list, so that a result being read
+    # from another thread never has a pod missing
+    pods = [existing for existing in self.pods or [] if existing.id != pod.id]
+    positions = [existing.position for existing in pods]
+    pods.insert(bisect_right(positions, pod.position), pod)
+    self.pods = pods
+
+    # The raw dictionary is kept in sync, as it is what gets cached,
+    # unless it was not kept in which case it is rebuilt from the fields
+    self.numpods = len(pods)
+    if self._raw is not None:
+      self._raw.update(pods=[existing.raw for existing in pods], numpods=self.numpods)
+
+  def merge_recalculated(self, other: FullResults):
+    """Merges the pods of the result of the :attr:`recalculate` url into the result,
+    which then reports the scanners and pods that timed out while recalculating"""
+    for pod in other.pods or []:
+      self.merge_pod(pod)
+    self._update_raw(**{
+      key: other.get(key, "")
+      for key in ("timedout", "timedoutpods", "recalculate")
+    })
+    self.recalculate = other.recalculate
+
   @property
   def is_fallthrough(self) -> bool:
     """If the result is a fallthrough result.
@@ -515,6 +815,7 @@ class FullResults(Model[FullResultsDict]):
 
 
 
+@slotted
 @dataclass
 class ConversationalResults(Model[ConversationalResultsDict]):
   conversationID: str
@@ -546,6 +847,9 @@ class ConversationalResults(Model[ConversationalResultsDict]):
 
 class SimpleImage:
   """Represents a GIF image given via the Simple API"""
+  # The number of attempts it took to receive the image, set by the client
+  attempts = 1
+
   def __init__(self, data: bytes):
     self._data = data
 
@@ -557,4 +861,28 @@ class SimpleImage:
   def save_to(self, fp: str):
     """Saves the image to a specified file path"""
     with open(fp, "wb") as f:
-      f.write(self.data)
\ No newline at end of file
+      f.write(self.data)
+
+
+
+@dataclass
+class BatchResult:
+  """The outcome of a single query sent as part of a batch"""
+  index: int
+  input: Union[str, Mapping[str, Any]]
+  result: Any = None
+  exception: Optional[Exception] = None
+
+  def __repr__(self):
+    return f"BatchResult(index={self.index}, ok={self.ok})"
+
+  @property
+  def ok(self) -> bool:
+    """If the query completed without raising an exception"""
+    return self.exception is None
+
+  def unwrap(self) -> Any:
+    """Returns the result of the query, or raises the exception it failed with"""
+    if self.exception is not None:
+      raise self.exception
+    return self.result
@@ -0,0 +1,161 @@
+"""
+Rate limiters used to pace requests made with an App ID
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from wolfram.exceptions import DeadlineExceeded
+
+
+@dataclass
+class RateLimiterStats:
+  """Wait time metrics collected by a rate limiter"""
+  acquired: int = 0
+  delayed: int = 0
+  total_wait: float = 0.0
+  max_wait: float = 0.0
+
+  @property
+  def mean_wait(self) -> float:
+    """The average time waited per acquired slot, in seconds"""
+    return self.total_wait / self.acquired if self.acquired else 0.0
+
+
+
+class RateLimiter:
+  """The base class of rate limiters.
+
+  Clients call :meth:`acquire` or :meth:`async_acquire` with their App ID
+  before every request, so a single limiter can be shared between
+  several clients to pace all requests made with the same App ID.
+  """
+
+  def acquire(self, key: str, timeout: Optional[float] = None) -> float:
+    """Blocks until a request can be made with `key`, returning the time waited in seconds
+
+    Raises
+    ------
+    ~wolfram.exceptions.DeadlineExceeded
+      The request could not be made within `timeout` seconds.
+    """
+    raise NotImplementedError
+
+  async def async_acquire(self, key: str, timeout: Optional[float] = None) -> float:
+    """|coro|
+
+    Waits until a request can be made with `key`, returning the time waited in seconds
+
+    Raises
+    ------
+    ~wolfram.exceptions.DeadlineExceeded
+      The request could not be made within `timeout` seconds.
+    """
+    raise NotImplementedError
+
+
+
+class _Bucket:
+  __slots__ = ("tokens", "updated")
+
+  def __init__(self, tokens: float, updated: float):
+    self.tokens = tokens
+    self.updated = updated
+
+
+
+class TokenBucketLimiter(RateLimiter):
+  """A token bucket rate limiter with a separate bucket per App ID
+
+  Each slot is reserved up front, so callers only sleep for their own
+  share of the wait and the limiter is never locked while waiting.
+  This makes it safe to share between threads and event loops.
+
+  Parameters
+  ----------
+  rate: `float`
+    The sustained number of requests allowed per second.
+  burst: `int`
+    The number of requests that can be made at once after a period of inactivity.
+    Defaults to `1`.
+  """
+
+  def __init__(self, rate: float, burst: int = 1):
+    if rate <= 0:
+      raise ValueError("rate must be positive")
+    if burst < 1:
+      raise ValueError("burst must be at least 1")
+    self._rate = rate
+    self._burst = burst
+    self._buckets: Dict[str, _Bucket] = {}
+    self._stats = RateLimiterStats()
+    self._lock = threading.Lock()
+
+  def __repr__(self):
+    return f"TokenBucketLimiter(rate={self._rate}, burst={self._burst})"
+
+  @property
+  def rate(self) -> float:
+    return self._rate
+
+  @property
+  def burst(self) -> int:
+    return self._burst
+
+  @property
+  def stats(self) -> RateLimiterStats:
+    """A snapshot of the wait time metrics of the limiter"""
+    with self._lock:
+      return RateLimiterStats(**vars(self._stats))
+
+  def _reserve(self, key: str) -> float:
+    """Takes a token from the bucket of `key`, returning how long to wait before using it"""
+    now = time.monotonic()
+    with self._lock:
+      bucket = self._buckets.get(key)
+      if bucket is None:
+        bucket = self._buckets[key] = _Bucket(self._burst, now)
+      bucket.tokens = min(self._burst, bucket.tokens + (now - bucket.updated) * self._rate)
+      bucket.updated = now
+      bucket.tokens -= 1
+      delay = -bucket.tokens / self._rate if bucket.tokens < 0 else 0.0
+
+      self._stats.acquired += 1
+      if delay > 0:
+        self._stats.delayed += 1
+        self._stats.total_wait += delay
+        self._stats.max_wait = max(self._stats.max_wait, delay)
+    return delay
+
+  def _refund(self, key: str):
+    with self._lock:
+      self._buckets[key].tokens += 1
+
+  def _check(self, key: str, delay: float, timeout: Optional[float]):
+    """Gives the slot back straight away if it cannot be used in time"""
+    if timeout is not None and delay > timeout:
+      self._refund(key)
+      raise DeadlineExceeded("rate limiter could not grant a slot before the deadline")
+
+  def acquire(self, key: str, timeout: Optional[float] = None) -> float:
+    delay = self._reserve(key)
+    self._check(key, delay, timeout)
+    if delay > 0:
+      time.sleep(delay)
+    return delay
+
+  async def async_acquire(self, key: str, timeout: Optional[float] = None) -> float:
+    delay = self._reserve(key)
+    self._check(key, delay, timeout)
+    if delay > 0:
+      try:
+        await asyncio.sleep(delay)
+      except asyncio.CancelledError:
+        # The slot was never used, so give it back to the next caller
+        self._refund(key)
+        raise
+    return delay
@@ -0,0 +1,161 @@
+"""
+Retry policies used to recover from transient failures
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, FrozenSet, Mapping, Optional, Tuple, Type
+
+import aiohttp
+import requests
+
+from wolfram.exceptions import WolframException
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+DEFAULT_RETRY_EXCEPTIONS = (
+  requests.ConnectionError,
+  requests.Timeout,
+  requests.exceptions.ChunkedEncodingError,
+  aiohttp.ClientConnectionError,
+  aiohttp.ClientPayloadError,
+  asyncio.TimeoutError
+)
+
+
+@dataclass
+class RetryStats:
+  """Counters collected by a retry policy"""
+  calls: int = 0
+  attempts: int = 0
+
+  @property
+  def retries(self) -> int:
+    """The number of attempts made on top of the first attempt of each call"""
+    return self.attempts - self.calls
+
+  @property
+  def amplification(self) -> float:
+    """The average number of attempts made per call"""
+    return self.attempts / self.calls if self.calls else 0.0
+
+
+
+class RetryPolicy:
+  """Describes when and how a failed request is retried
+
+  Only connection errors, timeouts and the given status codes are retried.
+  Exceptions raised by the API models, such as :class:`~wolfram.exceptions.InterpretationError`
+  or :class:`~wolfram.exceptions.InvalidAppID`, are never retried.
+
+  Parameters
+  ----------
+  max_attempts: `int`
+    The maximum number of attempts per request, including the first one. Defaults to `3`.
+  backoff_base: `float`
+    The backoff before the first retry, in seconds. It doubles on every
+    following retry. Defaults to `0.5`.
+  backoff_cap: `float`
+    The maximum backoff between two attempts, in seconds. Defaults to `30`.
+  statuses: FrozenSet[`int`]
+    The response status codes that are retried. Defaults to `429` and `5xx` gateway errors.
+  exceptions: Tuple[Type[`Exception`], ...]
+    The exceptions that are retried. Defaults to connection errors and timeouts.
+  respect_retry_after: `bool`
+    Whether to wait for as long as the `Retry-After` header of a response asks to,
+    instead of backing off. The wait is still capped by `backoff_cap`. Defaults to `True`.
+  """
+
+  def __init__(
+    self,
+    max_attempts: int = 3,
+    *,
+    backoff_base: float = 0.5,
+    backoff_cap: float = 30.0,
+    statuses: FrozenSet[int] = DEFAULT_RETRY_STATUSES,
+    exceptions: Tuple[Type[Exception], ...] = DEFAULT_RETRY_EXCEPTIONS,
+    respect_retry_after: bool = True
+  ):
+    if max_attempts < 1:
+      raise ValueError("max_attempts must be at least 1")
+    self.max_attempts = max_attempts
+    self.backoff_base = backoff_base
+    self.backoff_cap = backoff_cap
+    self.statuses = frozenset(statuses)
+    self.exceptions = tuple(exceptions)
+    self.respect_retry_after = respect_retry_after
+    self._stats = RetryStats()
+    self._lock = threading.Lock()
+
+  def __repr__(self):
+    return f"RetryPolicy(max_attempts={self.max_attempts})"
+
+  @property
+  def stats(self) -> RetryStats:
+    """A snapshot of the counters of the policy"""
+    with self._lock:
+      return RetryStats(**vars(self._stats))
+
+  def retry_status(self, attempt: int, status: int) -> bool:
+    """If a response with `status` received on attempt number `attempt` should be retried"""
+    return attempt < self.max_attempts and status in self.statuses
+
+  def retry_exception(self, attempt: int, exc: Exception) -> bool:
+    """If `exc` raised on attempt number `attempt` should be retried"""
+    return (
+      attempt < self.max_attempts
+      and not isinstance(exc, WolframException)
+      and isinstance(exc, self.exceptions)
+    )
+
+  def backoff(self, attempt: int, headers: Optional[Mapping[str, str]] = None) -> float:
+    """Returns how long to wait after attempt number `attempt` failed, in seconds.
+    This is a random value between zero and the exponential backoff (full jitter),
+    unless the response asked to retry after a specific amount of time.
+    Either way, the wait never exceeds `backoff_cap`"""
+    if self.respect_retry_after and headers is not None:
+      retry_after = _parse_retry_after(headers.get("Retry-After"))
+      if retry_after is not None:
+        # A server cannot stall the caller for longer than the policy allows
+        return min(retry_after, self.backoff_cap)
+    return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1)))
+
+  def record(self, attempts: int):
+    """Records a finished call that took `attempts` attempts"""
+    with self._lock:
+      self._stats.calls += 1
+      self._stats.attempts += attempts
+
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+  """Parses the value of a `Retry-After` header, which is either seconds or a date"""
+  if value is None:
+    return None
+  try:
+    return max(0.0, float(value))
+  except ValueError:
+    pass
+  try:
+    date = parsedate_to_datetime(value)
+  except (TypeError, ValueError):
+    return None
+  if date.tzinfo is None:
+    date = date.replace(tzinfo=timezone.utc)
+  return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+def set_attempts(result: Any, attempts: int) -> Any:
+  """Records the number of attempts on a result, if it is able to hold it.
+  Results that cannot, such as the `str` results of the Short Answers and
+  Spoken Results APIs, are returned without the number of attempts"""
+  try:
+    result.attempts = attempts
+  except AttributeError:
+    pass
+  return result
@@ -0,0 +1,237 @@
+"""
+Routers used to send queries to the cheapest API that answers them
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from wolfram.api import API, FullResultsAPI, ShortAPI, SpokenAPI
+from wolfram.exceptions import InterpretationError
+from wolfram.models import FullResults
+
+if TYPE_CHECKING:
+  from wolfram.client import AsyncClient, Client
+
+
+@dataclass
+class TierStats:
+  """Counters collected by a router for a single tier"""
+  requests: int = 0
+  hits: int = 0
+  total_latency: float = 0.0
+
+  @property
+  def escalations(self) -> int:
+    """The number of queries this tier could not answer"""
+    return self.requests - self.hits
+
+  @property
+  def hit_rate(self) -> float:
+    """The fraction of queries this tier answered"""
+    return self.hits / self.requests if self.requests else 0.0
+
+  @property
+  def mean_latency(self) -> float:
+    """The average time taken by this tier per query, in seconds"""
+    return self.total_latency / self.requests if self.requests else 0.0
+
+
+
+@dataclass
+class RoutedResult:
+  """The result of a routed query, along with the API that answered it"""
+  api: Type[API]
+  result: Any
+  escalations: int = 0
+
+  def __repr__(self):
+    return f"RoutedResult(api={self.api.__name__}, escalations={self.escalations})"
+
+
+
+class EscalationPolicy:
+  """Describes when a router moves on from a tier to the next one
+
+  Parameters
+  ----------
+  exceptions: Tuple[Type[`Exception`], ...]
+    The exceptions that escalate the query. Other exceptions are raised
+    straight away. Defaults to :class:`~wolfram.exceptions.InterpretationError`.
+  accept: Optional[Callable[[Type[:class:`~wolfram.api.API`], Any], `bool`]]
+    A function called with the API and the result of a tier, returning whether
+    the result is good enough. If not given, every result is accepted except
+    unsuccessful :class:`~wolfram.models.FullResults`.
+  """
+
+  def __init__(
+    self,
+    exceptions: Tuple[Type[Exception], ...] = (InterpretationError,),
+    accept: Optional[Callable[[Type[API], Any], bool]] = None
+  ):
+    self.exceptions = tuple(exceptions)
+    self.accept = accept
+
+  def __repr__(self):
+    return f"EscalationPolicy(exceptions={self.exceptions})"
+
+  def escalate_result(self, api: Type[API], result: Any) -> bool:
+    """If a result returned by `api` should be escalated to the next tier"""
+    if self.accept is None:
+      return isinstance(result, FullResults) and not result.success
+    return not self.accept(api, result)
+
+  def escalate_exception(self, api: Type[API], exc: Exception) -> bool:
+    """If `exc` raised by `api` should be escalated to the next tier"""
+    return isinstance(exc, self.exceptions)
+
+
+
+class Router:
+  """Sends queries to the cheapest API first, escalating to more expensive ones
+  only when it cannot answer them
+
+  By default a query is sent to the Short Answers API, then to the Spoken Results API,
+  then to the Full Results API, moving on whenever the input cannot be interpreted.
+  Queries that need pods go straight to the Full Results API.
+
+  Parameters
+  ----------
+  client: Union[:class:`~wolfram.Client`, :class:`~wolfram.AsyncClient`]
+    The client queries are sent with. Use :meth:`query` with a :class:`~wolfram.Client`,
+    and :meth:`async_query` with an :class:`~wolfram.AsyncClient`.
+  tiers: Sequence[Type[:class:`~wolfram.api.API`]]
+    The APIs to try, from the cheapest to the most expensive.
+  policy: Optional[:class:`EscalationPolicy`]
+    The policy deciding when a query is escalated. Defaults to escalating
+    inputs that could not be interpreted.
+  """
+
+  DEFAULT_TIERS = (ShortAPI, SpokenAPI, FullResultsAPI)
+
+  def __init__(
+    self,
+    client: Union[Client, AsyncClient],
+    tiers: Sequence[Type[API]] = DEFAULT_TIERS,
+    *,
+    policy: Optional[EscalationPolicy] = None
+  ):
+    if not tiers:
+      raise ValueError("at least one tier is required")
+    self._client = client
+    self._tiers = tuple(tiers)
+    self._policy = policy if policy is not None else EscalationPolicy()
+    self._stats: Dict[Type[API], TierStats] = {api: TierStats() for api in self._tiers}
+    self._lock = threading.Lock()
+
+  def __repr__(self):
+    return f"Router(tiers=[{', '.join(api.__name__ for api in self._tiers)}])"
+
+  @property
+  def tiers(self) -> Tuple[Type[API], ...]:
+    return self._tiers
+
+  @property
+  def policy(self) -> EscalationPolicy:
+    return self._policy
+
+  @property
+  def stats(self) -> Dict[str, TierStats]:
+    """A snapshot of the counters of every tier, by API name"""
+    with self._lock:
+      return {api.__name__: TierStats(**vars(stats)) for api, stats in self._stats.items()}
+
+  def _route(self, pods: bool) -> List[Type[API]]:
+    """Returns the tiers a query is sent to, in order"""
+    if not pods:
+      return list(self._tiers)
+    tiers = [api for api in self._tiers if issubclass(api, FullResultsAPI)]
+    if not tiers:
+      raise ValueError("pods were requested but no tier returns them")
+    return tiers
+
+  def _record(self, api: Type[API], hit: bool, latency: float):
+    with self._lock:
+      stats = self._stats[api]
+      stats.requests += 1
+      stats.hits += hit
+      stats.total_latency += latency
+
+  def _send(self, api: Type[API], input: str, params: Dict[str, Any]):
+    """Sends a query to a tier, going through the method of the client that normalises
+    the parameters of the Full Results API, so that routed queries share its cache keys"""
+    if issubclass(api, FullResultsAPI):
+      return self._client.full_results_query(input, **params)
+    return self._client.query(api, **{api.INPUT: input}, **params)
+
+  def query(self, input: str, *, pods: bool = False, **params) -> RoutedResult:
+    """
+
+    Send a query to the cheapest tier that answers it.
+
+    Parameters
+    ----------
+    input: `str`
+      The input string to be interpreted.
+    pods: `bool`
+      Whether the result needs pods, in which case only the Full Results API is queried.
+    \*\*params
+      A keyword argument list of other parameters to be passed to every tier.
+
+    Raises
+    ------
+    ~wolfram.InterpretationError
+      Input was unable to be interpreted by any tier.
+    """
+    tiers = self._route(pods)
+    for escalations, api in enumerate(tiers):
+      start = time.monotonic()
+      try:
+        result = self._send(api, input, params)
+      except Exception as e:
+        self._record(api, False, time.monotonic() - start)
+        if api is tiers[-1] or not self._policy.escalate_exception(api, e):
+          raise
+        continue
+
+      accepted = not self._policy.escalate_result(api, result)
+      self._record(api, accepted, time.monotonic() - start)
+      if accepted or api is tiers[-1]:
+        return RoutedResult(api, result, escalations)
+
+  async def async_query(self, input: str, *, pods: bool = False, **params) -> RoutedResult:
+    """|coro|
+
+    Send a query to the cheapest tier that answers it.
+
+    Parameters
+    ----------
+    input: `str`
+      The input string to be interpreted.
+    pods: `bool`
+      Whether the result needs pods, in which case only the Full Results API is queried.
+    \*\*params
+      A keyword argument list of other parameters to be passed to every tier.
+
+    Raises
+    ------
+    ~wolfram.InterpretationError
+      Input was unable to be interpreted by any tier.
+    """
+    tiers = self._route(pods)
+    for escalations, api in enumerate(tiers):
+      start = time.monotonic()
+      try:
+        result = await self._send(api, input, params)
+      except Exception as e:
+        self._record(api, False, time.monotonic() - start)
+        if api is tiers[-1] or not self._policy.escalate_exception(api, e):
+          raise
+        continue
+
+      accepted = not self._policy.escalate_result(api, result)
+      self._record(api, accepted, time.monotonic() - start)
+      if accepted or api is tiers[-1]:
+        return RoutedResult(api, result, escalations)